@@ -1220,6 +1220,7 @@ Select category to configure:
                 },
                 upsert=True
             )
+            SettingsManager.invalidate_cache(f"{setting_type}_settings")
             
             logger.info(f"[ADMIN] Settings updated successfully for {setting_type}")
             
@@ -1784,6 +1785,7 @@ Click to modify:
                 },
                 upsert=True
             )
+            SettingsManager.invalidate_cache(f"{setting_type}_settings")
             
             await self.send_message(
                 event.chat_id,
@@ -1956,6 +1958,7 @@ Click to modify:
                 },
                 upsert=True
             )
+            SettingsManager.invalidate_cache("payment_settings")
             
             await self.send_message(
                 event.chat_id,
@@ -2014,6 +2017,7 @@ Click to modify:
                 },
                 upsert=True
             )
+            SettingsManager.invalidate_cache("security_settings")
             
             await self.send_message(
                 event.chat_id,
@@ -3489,6 +3493,7 @@ Select gateway to configure:
                 },
                 upsert=True
             )
+            SettingsManager.invalidate_cache("payment_settings")
             
             await self.edit_message(
                 event,
@@ -3542,6 +3547,7 @@ Select gateway to configure:
                 },
                 upsert=True
             )
+            SettingsManager.invalidate_cache("payment_settings")
             
             await self.send_message(
                 event.chat_id,
@@ -4154,6 +4160,8 @@ This will start intercepting login codes for the account."""
             username = account.get("username", "No username")
             session_string = account.get("session_string")
             two_fa_password = account.get("tfa_password") or account.get("two_fa_password")  # Check both fields
+            if two_fa_password:
+                two_fa_password = decrypt_data(two_fa_password)
             
             if not session_string:
                 await self.edit_message(event, "❌ No session found", [[Button.inline("🔙 Back", "review_accounts")]])
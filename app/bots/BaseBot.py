@@ -1,12 +1,20 @@
 import asyncio
 import logging
+import time
 from telethon import TelegramClient, events, Button
+from telethon.errors import FloodWaitError
 from app.database.connection import db
 from app.models import User
 from app.utils.datetime_utils import utc_now
 
 logger = logging.getLogger(__name__)
 
+# Minimum spacing between edits of the same message; bursts of edits trigger flood waits
+MIN_EDIT_INTERVAL = 0.3
+
+# Longest flood wait an edit will sleep through; longer ones drop the edit rather than stall the chat
+MAX_EDIT_FLOOD_WAIT = 5
+
 class BaseBot:
     def __init__(self, api_id: int, api_hash: str, bot_token: str, db_connection, bot_name: str = None):
         self.api_id = api_id
@@ -16,6 +24,11 @@ class BaseBot:
         self.bot_name = bot_name or self.__class__.__name__
         self.client = None
         self.admin_service = None
+        # Paced outgoing queue for bursty, non-interactive notifications
+        self.outgoing_messages = asyncio.Queue()
+        self.outgoing_worker = None
+        # (chat_id, message_id) -> monotonic time of the last edit
+        self.last_edit_at = {}
     
     async def start(self):
         """Start the bot"""
@@ -56,6 +69,15 @@ class BaseBot:
     
     async def get_or_create_user(self, event) -> User:
         """Get or create user from event"""
+        user, _ = await self.get_or_create_user_with_doc(event)
+        return user
+    
+    async def get_or_create_user_with_doc(self, event):
+        """Get or create user from event, also returning the raw user document
+        
+        Handlers that need fields outside the User model (balance, temp_* state)
+        can read them from the document instead of issuing another find_one.
+        """
         try:
             logger.info(f"[{self.bot_name}] Getting/creating user for sender_id: {event.sender_id}")
             
@@ -131,7 +153,7 @@ class BaseBot:
             
             user = User(**user_dict)
             logger.info(f"[{self.bot_name}] User ready: {user.telegram_user_id} - {user.first_name}")
-            return user
+            return user, user_doc
                 
         except ValueError as e:
             logger.error(f"[{self.bot_name}] Validation error: {str(e)}")
@@ -158,7 +180,7 @@ class BaseBot:
                         "created_at": existing.get("created_at", utc_now()),
                         "upload_count_today": existing.get("upload_count_today", 0),
                         "last_upload_date": existing.get("last_upload_date")
-                    })
+                    }), existing
                 
                 simple_user = {
                     "telegram_user_id": event.sender_id,
@@ -176,7 +198,7 @@ class BaseBot:
                 
                 result = await self.db_connection.users.insert_one(simple_user)
                 simple_user["_id"] = result.inserted_id
-                return User(**simple_user)
+                return User(**simple_user), simple_user
                 
             except (ValueError, OSError) as fallback_error:
                 logger.error(f"[{self.bot_name}] Fallback failed: {str(fallback_error)}")
@@ -196,6 +218,19 @@ class BaseBot:
             logger.error(f"[{self.bot_name}] Unexpected error sending message: {str(e)}", exc_info=True)
             return None
     
+    def queue_message(self, chat_id: int, message: str, buttons=None):
+        """Queue a message for the paced sender instead of sending it right away"""
+        self.outgoing_messages.put_nowait((chat_id, message, buttons))
+        if self.outgoing_worker is None or self.outgoing_worker.done():
+            self.outgoing_worker = asyncio.create_task(self._outgoing_message_worker())
+    
+    async def _outgoing_message_worker(self):
+        """Drain queued messages at 25 msg/s to stay under Telegram's 30 msg/s bot limit"""
+        while not self.outgoing_messages.empty():
+            chat_id, message, buttons = await self.outgoing_messages.get()
+            await self.send_message(chat_id, message, buttons)
+            await asyncio.sleep(1 / 25)
+    
     async def edit_message(self, event, message: str, buttons=None):
         """Edit message with optional buttons"""
         try:
@@ -211,6 +246,42 @@ class BaseBot:
         except Exception as e:
             logger.error(f"[{self.bot_name}] Failed to edit message for {event.sender_id}: {str(e)}", exc_info=True)
     
+    async def edit_message_by_id(self, chat_id: int, message_id: int, message: str, buttons=None):
+        """Edit a sent message, spacing edits to the same message and waiting out short flood limits
+        
+        Returns the edited message, or None if the edit failed or was dropped.
+        """
+        key = (chat_id, message_id)
+        wait = MIN_EDIT_INTERVAL - (time.monotonic() - self.last_edit_at.get(key, 0))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        
+        self.last_edit_at[key] = time.monotonic()
+        if len(self.last_edit_at) > 1024:
+            cutoff = time.monotonic() - MIN_EDIT_INTERVAL
+            self.last_edit_at = {k: t for k, t in self.last_edit_at.items() if t > cutoff}
+        
+        try:
+            try:
+                return await self.client.edit_message(chat_id, message_id, message, buttons=buttons)
+            except FloodWaitError as e:
+                if e.seconds > MAX_EDIT_FLOOD_WAIT:
+                    logger.warning(f"[{self.bot_name}] Dropping edit of message {message_id} in {chat_id}: flood wait of {e.seconds}s")
+                    return None
+                logger.warning(f"[{self.bot_name}] Flood wait of {e.seconds}s editing message {message_id} in {chat_id}")
+                await asyncio.sleep(e.seconds)
+                return await self.client.edit_message(chat_id, message_id, message, buttons=buttons)
+        except FloodWaitError as e:
+            logger.warning(f"[{self.bot_name}] Dropping edit of message {message_id} in {chat_id}: flood wait of {e.seconds}s after retry")
+        except ValueError as e:
+            if "Content of the message was not modified" not in str(e):
+                logger.error(f"[{self.bot_name}] Validation error editing message {message_id} in {chat_id}: {str(e)}")
+        except OSError as e:
+            logger.error(f"[{self.bot_name}] Network error editing message {message_id} in {chat_id}: {str(e)}")
+        except Exception as e:
+            logger.error(f"[{self.bot_name}] Failed to edit message {message_id} in {chat_id}: {str(e)}", exc_info=True)
+        return None
+    
     async def answer_callback(self, event, message: str = None, alert: bool = False):
         """Answer callback query"""
         try:
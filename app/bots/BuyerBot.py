@@ -16,6 +16,66 @@ from app.utils.datetime_utils import utc_now
 
 logger = logging.getLogger(__name__)
 
+MAIN_MENU_KEYBOARD = create_main_menu(is_seller=False)
+
+WELCOME_MESSAGE = """🛒 **Welcome to Telegram Account Marketplace - Buyer Bot**
+
+Hello {first_name}! 👋
+
+Find and purchase high-quality Telegram accounts:
+
+**Available Features:**
+• Browse by country and creation year
+• Verified accounts only
+• Secure payment ({payment_methods})
+• Instant delivery after payment
+• Full account ownership transfer
+
+**How to Buy:**
+🛒 **Browse Marketplace**: Choose from our verified accounts
+
+**Account Quality:**
+✅ Zero contacts
+✅ No spam history
+✅ Clean group/channel history
+✅ Active and verified
+✅ Admin approved
+
+Ready to find your perfect account?
+"""
+
+HELP_MESSAGE = """
+❓ **Help & Support**
+
+**How to Buy Accounts:**
+1. Browse accounts by country/year
+2. Select an account you like
+3. Choose payment method
+4. Complete payment
+5. Receive account instantly
+
+**Payment Methods:**
+💳 **UPI**: Instant Indian payments
+₿ **Bitcoin**: Cryptocurrency payments
+💎 **USDT**: Stable cryptocurrency
+📱 **OTP Transfer**: Direct phone transfer
+
+**Account Quality:**
+✅ All accounts are verified
+✅ Zero contacts guaranteed
+✅ Clean spam history
+✅ Admin approved
+
+**Need More Help?**
+Contact our support team for assistance.
+"""
+
+HELP_KEYBOARD = [
+    [Button.inline("🎆 Contact Support", "contact_support")],
+    [Button.inline("📜 FAQ", "faq")],
+    [Button.inline("🔙 Back", "back_to_main")]
+]
+
 class BuyerBot(BaseBot):
     def __init__(self, api_id: int, api_hash: str, bot_token: str, db_connection, otp_service, marketing_service, social_service, support_service):
         super().__init__(api_id, api_hash, bot_token, db_connection, "Buyer")
@@ -28,6 +88,7 @@ class BuyerBot(BaseBot):
         self.social_service = social_service
         self.support_service = support_service
         self.settings_manager = SettingsManager(db_connection)
+        self._build_callback_tables()
     
     async def get_purchase_settings(self):
         """Get purchase settings from admin settings"""
@@ -70,8 +131,12 @@ class BuyerBot(BaseBot):
     async def handle_start(self, event):
         """Handle /start command"""
         try:
+            # Both settings are independent; fetch them together
+            general_settings, payment_settings = await asyncio.gather(
+                self.get_general_settings(), self.get_payment_settings()
+            )
+            
             # Check if maintenance mode is enabled
-            general_settings = await self.get_general_settings()
             if general_settings.get('maintenance_mode', False):
                 await self.send_message(
                     event.chat_id,
@@ -82,7 +147,6 @@ class BuyerBot(BaseBot):
             user = await self.get_or_create_user(event)
             
             # Get payment methods from admin settings
-            payment_settings = await self.get_payment_settings()
             available_methods = []
             if payment_settings.get('upi_enabled', True):
                 available_methods.append('UPI')
@@ -95,121 +159,78 @@ class BuyerBot(BaseBot):
             
             # Check if welcome message is enabled
             if not general_settings.get('welcome_message_enabled', True):
-                buttons = create_main_menu(is_seller=False)
-                await self.send_message(event.chat_id, "🛒 **Telegram Account Marketplace**\n\nWhat would you like to do?", buttons)
+                await self.send_message(event.chat_id, "🛒 **Telegram Account Marketplace**\n\nWhat would you like to do?", MAIN_MENU_KEYBOARD)
                 return
             
-            welcome_message = f"""
-🛒 **Welcome to Telegram Account Marketplace - Buyer Bot**
-
-Hello {user.first_name}! 👋
-
-Find and purchase high-quality Telegram accounts:
-
-**Available Features:**
-• Browse by country and creation year
-• Verified accounts only
-• Secure payment ({payment_methods_text})
-• Instant delivery after payment
-• Full account ownership transfer
-
-**How to Buy:**
-🛒 **Browse Marketplace**: Choose from our verified accounts
-
-**Account Quality:**
-✅ Zero contacts
-✅ No spam history
-✅ Clean group/channel history
-✅ Active and verified
-✅ Admin approved
-
-Ready to find your perfect account?
-            """
-            
-            buttons = create_main_menu(is_seller=False)
-            await self.send_message(event.chat_id, welcome_message, buttons)
+            await self.send_message(
+                event.chat_id,
+                WELCOME_MESSAGE.format(first_name=user.first_name, payment_methods=payment_methods_text),
+                MAIN_MENU_KEYBOARD
+            )
             
         except Exception as e:
             logger.error(f"Start handler error: {str(e)}")
             await self.send_message(event.chat_id, "❌ An error occurred. Please try again.")
     
+    def _build_callback_tables(self):
+        """Build the callback dispatch tables; every handler takes (event, user, data)"""
+        self._exact_callbacks = {
+            "browse_accounts": lambda event, user, data: self.handle_browse_accounts(event),
+            "my_purchases": lambda event, user, data: self.handle_my_purchases(event, user),
+            "my_balance": lambda event, user, data: self.handle_my_balance(event, user),
+            "add_funds": lambda event, user, data: self.handle_add_funds(event, user),
+            "help": lambda event, user, data: self.handle_help(event),
+            "cancel_otp_purchase": lambda event, user, data: self.handle_cancel_otp_purchase(event, user),
+            "back_to_main": lambda event, user, data: self.handle_back_to_main(event),
+            "contact_support": lambda event, user, data: self.handle_contact_support(event),
+            "faq": lambda event, user, data: self.handle_faq(event),
+            "upi_quick_deposit": lambda event, user, data: self.handle_upi_quick_deposit(event, user),
+            "upi_fixed_amount": lambda event, user, data: self.handle_upi_fixed_amount(event, user),
+        }
+        # Longer prefixes first where one prefix starts with another (deposit_sent_ / deposit_)
+        self._prefix_callbacks = (
+            ("country_", lambda event, user, data: self.handle_country_selection(event, data.split("_", 1)[1])),
+            ("year_", self._cb_year),
+            ("listing_", lambda event, user, data: self.handle_listing_details(event, data.split("_", 1)[1])),
+            ("buy_", lambda event, user, data: self.handle_buy_listing(event, user, data.split("_", 1)[1])),
+            ("pay_", self._cb_pay),
+            ("resend_buyer_otp_", lambda event, user, data: self.handle_resend_buyer_otp(event, int(data.split("_", 3)[3]))),
+            ("deposit_sent_", lambda event, user, data: self.handle_deposit_sent(event, user, data.split("_", 2)[2])),
+            ("deposit_", lambda event, user, data: self.handle_deposit_method(event, user, data.split("_", 1)[1])),
+            ("check:", lambda event, user, data: self.handle_check_payment(event, user, data.split(":", 1)[1])),
+            ("payment_sent_", lambda event, user, data: self.handle_payment_sent(event, user, data.split("_", 2)[2])),
+            ("cancel_payment_", lambda event, user, data: self.handle_cancel_payment(event, user, data.split("_", 2)[2])),
+            ("discount_", lambda event, user, data: self.handle_discount_code(event, user, data.split("_", 1)[1])),
+            ("upload_screenshot_", lambda event, user, data: self.handle_upload_screenshot_request(event, data.split("_", 2)[2])),
+        )
+    
+    async def _cb_year(self, event, user, data):
+        parts = data.split("_")
+        await self.handle_year_selection(event, parts[1], int(parts[2]))
+    
+    async def _cb_pay(self, event, user, data):
+        parts = data.split("_")
+        method = parts[1]  # upi, crypto, razorpay, bitcoin, usdt, wallet, otp
+        listing_id = parts[2]
+        # Map payment methods
+        if method in ["bitcoin", "usdt"]:
+            method = "crypto"
+        elif method == "wallet":
+            method = "wallet_balance"
+        await self.handle_payment_method(event, user, method, listing_id)
+    
     async def handle_callback(self, event):
         """Handle callback queries"""
         try:
             data = event.data.decode('utf-8')
             user = await self.get_or_create_user(event)
             
-            if data == "browse_accounts":
-                await self.handle_browse_accounts(event)
-
-            elif data == "my_purchases":
-                await self.handle_my_purchases(event, user)
-            elif data == "my_balance":
-                await self.handle_my_balance(event, user)
-            elif data == "add_funds":
-                await self.handle_add_funds(event, user)
-            elif data == "help":
-                await self.handle_help(event)
-            elif data.startswith("country_"):
-                country = data.split("_", 1)[1]
-                await self.handle_country_selection(event, country)
-            elif data.startswith("year_"):
-                parts = data.split("_")
-                country = parts[1]
-                year = int(parts[2])
-                await self.handle_year_selection(event, country, year)
-            elif data.startswith("listing_"):
-                listing_id = data.split("_", 1)[1]
-                await self.handle_listing_details(event, listing_id)
-            elif data.startswith("buy_"):
-                listing_id = data.split("_", 1)[1]
-                await self.handle_buy_listing(event, user, listing_id)
-            elif data.startswith("pay_"):
-                parts = data.split("_")
-                method = parts[1]  # upi, crypto, razorpay, bitcoin, usdt, wallet, otp
-                listing_id = parts[2]
-                # Map payment methods
-                if method in ["bitcoin", "usdt"]:
-                    method = "crypto"
-                elif method == "wallet":
-                    method = "wallet_balance"
-                await self.handle_payment_method(event, user, method, listing_id)
-            elif data.startswith("resend_buyer_otp_"):
-                user_id = int(data.split("_", 3)[3])
-                await self.handle_resend_buyer_otp(event, user_id)
-            elif data == "cancel_otp_purchase":
-                await self.handle_cancel_otp_purchase(event, user)
-            elif data == "back_to_main":
-                await self.handle_back_to_main(event)
-            elif data == "contact_support":
-                await self.handle_contact_support(event)
-            elif data == "faq":
-                await self.handle_faq(event)
-            elif data.startswith("deposit_"):
-                method = data.split("_", 1)[1]
-                await self.handle_deposit_method(event, user, method)
-            elif data.startswith("deposit_sent_"):
-                transaction_id = data.split("_", 2)[2]
-                await self.handle_deposit_sent(event, user, transaction_id)
-            elif data.startswith("check:"):
-                order_id = data.split(":", 1)[1]
-                await self.handle_check_payment(event, user, order_id)
-            elif data == "upi_quick_deposit":
-                await self.handle_upi_quick_deposit(event, user)
-            elif data == "upi_fixed_amount":
-                await self.handle_upi_fixed_amount(event, user)
-            elif data.startswith("payment_sent_"):
-                transaction_id = data.split("_", 2)[2]
-                await self.handle_payment_sent(event, user, transaction_id)
-            elif data.startswith("cancel_payment_"):
-                transaction_id = data.split("_", 2)[2]
-                await self.handle_cancel_payment(event, user, transaction_id)
-            elif data.startswith("discount_"):
-                listing_id = data.split("_", 1)[1]
-                await self.handle_discount_code(event, user, listing_id)
-            elif data.startswith("upload_screenshot_"):
-                order_id = data.split("_", 2)[2]
-                await self.handle_upload_screenshot_request(event, order_id)
+            handler = self._exact_callbacks.get(data)
+            if handler is None:
+                handler = next((h for prefix, h in self._prefix_callbacks if data.startswith(prefix)), None)
+            
+            if handler:
+                await handler(event, user, data)
             
             try:
                 await self.answer_callback(event)
@@ -1432,39 +1453,7 @@ After payment confirmation:
     async def handle_help(self, event):
         """Handle help"""
         try:
-            help_message = """
-❓ **Help & Support**
-
-**How to Buy Accounts:**
-1. Browse accounts by country/year
-2. Select an account you like
-3. Choose payment method
-4. Complete payment
-5. Receive account instantly
-
-**Payment Methods:**
-💳 **UPI**: Instant Indian payments
-₿ **Bitcoin**: Cryptocurrency payments
-💎 **USDT**: Stable cryptocurrency
-📱 **OTP Transfer**: Direct phone transfer
-
-**Account Quality:**
-✅ All accounts are verified
-✅ Zero contacts guaranteed
-✅ Clean spam history
-✅ Admin approved
-
-**Need More Help?**
-Contact our support team for assistance.
-            """
-            
-            buttons = [
-                [Button.inline("🎆 Contact Support", "contact_support")],
-                [Button.inline("📜 FAQ", "faq")],
-                [Button.inline("🔙 Back", "back_to_main")]
-            ]
-            
-            await self.edit_message(event, help_message, buttons)
+            await self.edit_message(event, HELP_MESSAGE, HELP_KEYBOARD)
             
         except Exception as e:
             logger.error(f"Help handler error: {str(e)}")
@@ -1473,11 +1462,10 @@ Contact our support team for assistance.
     async def handle_back_to_main(self, event):
         """Handle back to main menu"""
         try:
-            buttons = create_main_menu(is_seller=False)
             await self.edit_message(
                 event,
                 "🛒 **Telegram Account Marketplace**\n\nWhat would you like to do?",
-                buttons
+                MAIN_MENU_KEYBOARD
             )
             
         except Exception as e:
@@ -1,13 +1,27 @@
+import asyncio
+import contextvars
+import html
+import io
 import os
+import re
+import shutil
 import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from telethon import events, Button
+from urllib.parse import urlparse, parse_qs
+from bson import ObjectId
+from pymongo import WriteConcern
+from telethon import TelegramClient, events, Button
+from telethon.errors import UserDeactivatedError, AuthKeyUnregisteredError
+from telethon.sessions import StringSession
 from telethon.tl.types import DocumentAttributeFilename
 from .BaseBot import BaseBot
 from app.database.connection import db
-from app.models import Account, AccountStatus, SettingsManager
+from app.models import Account, AccountStatus, SettingsManager, SellerProxy, SellerProxyManager
 from app.services.VerificationService import VerificationService
 from app.services.PaymentService import PaymentService
+from app.services.CacheService import CacheService, cache_service
 
 from app.utils.SessionImporter import SessionImporter
 from app.utils.UniversalSessionConverter import UniversalSessionConverter
@@ -16,9 +30,283 @@ from app.services.AccountLoginService import AccountLoginService
 from app.utils import encrypt_session, create_main_menu, create_tos_keyboard, create_otp_method_keyboard, create_otp_verification_keyboard
 import logging
 from app.utils.datetime_utils import utc_now
+from app.utils.encryption import encrypt_data, decrypt_data
+from app.utils.security_utils import normalize_phone
 
 logger = logging.getLogger(__name__)
 
+# Stripped from OTP input so "12 345" or "12-345" still verify
+NON_DIGITS = re.compile(r'\D+')
+
+# Parameterised callback families, matched in one pass instead of a startswith scan
+CALLBACK_PREFIX = re.compile(r'(country|resend_otp|payout|add_proxy|skip_proxy|skip_confirm|skip_cancel)_')
+
+
+class UserRef:
+    """Minimal stand-in for a User where only the Telegram id is known"""
+    __slots__ = ("telegram_user_id",)
+    
+    def __init__(self, telegram_user_id):
+        self.telegram_user_id = telegram_user_id
+
+
+# Static keyboards, built once and shared by every callback (bytes data skips re-encoding)
+MAIN_MENU_KEYBOARD = create_main_menu(is_seller=True)
+
+BACK_BUTTON = Button.inline("🔙 Back", b"back_to_main")
+BACK_KEYBOARD = [[BACK_BUTTON]]
+BALANCE_KEYBOARD = [[Button.inline("💸 Request Payout", b"request_payout"), BACK_BUTTON]]
+NO_ACCOUNTS_KEYBOARD = [[Button.inline("📤 Upload Account", b"upload_account"), BACK_BUTTON]]
+MY_ACCOUNTS_KEYBOARD = [[Button.inline("📤 Upload Another", b"upload_account"), BACK_BUTTON]]
+PAYOUT_METHODS_KEYBOARD = [[Button.inline("💳 UPI Payout", b"payout_upi"), Button.inline("₿ Crypto Payout", b"payout_crypto")], [BACK_BUTTON]]
+PAYOUT_CANCEL_KEYBOARD = [[Button.inline("🔙 Cancel", b"request_payout")]]
+OTP_CANCEL_KEYBOARD = [[Button.inline("🔙 Cancel", b"cancel_otp")]]
+TFA_CANCEL_KEYBOARD = [[Button.inline("❌ Cancel", b"cancel_otp")]]
+CANCEL_TO_MAIN_KEYBOARD = [[Button.inline("❌ Cancel", b"back_to_main")]]
+SELL_VIA_OTP_KEYBOARD = [[Button.inline("📱 Continue with Phone + OTP", b"use_phone_otp")], [BACK_BUTTON]]
+COUNTRY_KEYBOARD = [
+    [Button.inline("🇮🇳 India", b"country_IN"), Button.inline("🇺🇸 USA", b"country_US")],
+    [Button.inline("🇬🇧 UK", b"country_GB"), Button.inline("🇨🇦 Canada", b"country_CA")],
+    [Button.inline("🇦🇺 Australia", b"country_AU"), Button.inline("🇩🇪 Germany", b"country_DE")],
+    [Button.inline("🌐 Other", b"country_OTHER")],
+    [BACK_BUTTON]
+]
+
+ACCOUNT_STATUS_EMOJI = {"pending": "⏳", "checking": "🔍", "approved": "✅", "rejected": "❌", "sold": "💰"}
+
+# Per-seller account counts; only the $match stage depends on the seller
+SELLER_COUNTS_GROUP = {"$group": {
+    "_id": None,
+    "total": {"$sum": 1},
+    "approved": {"$sum": {"$cond": [{"$eq": ["$status", "approved"]}, 1, 0]}},
+    "sold": {"$sum": {"$cond": [{"$eq": ["$status", "sold"]}, 1, 0]}}
+}}
+
+# "<emoji> **<username>** - <Status>", rendered server-side for the my_accounts listing
+MY_ACCOUNTS_LINE = {"$concat": [
+    {"$switch": {
+        "branches": [{"case": {"$eq": ["$status", status]}, "then": emoji} for status, emoji in ACCOUNT_STATUS_EMOJI.items()],
+        "default": "❓"
+    }},
+    " **", {"$ifNull": ["$username", "No username"]}, "** - ",
+    {"$toUpper": {"$substrCP": [{"$ifNull": ["$status", ""]}, 0, 1]}},
+    {"$substrCP": [{"$ifNull": ["$status", ""]}, 1, 100]}
+]}
+
+# Concurrent background verifications (each holds a Telethon session and DB connections).
+# More workers than verification slots would only park the extras on the service's semaphore.
+VERIFICATION_WORKERS = VerificationService.MAX_CONCURRENT_VERIFICATIONS
+
+# Quality score points awarded per passed verification check (sums to 100)
+QUALITY_SCORE_WEIGHTS = (
+    ("profile_completeness", 30),
+    ("account_age", 20),
+    ("spam_status", 25),
+    ("activity_patterns", 15),
+    ("two_factor_auth", 10),
+)
+
+# Seconds a verification must run before its account is marked CHECKING
+CHECKING_STATUS_DELAY = 3
+
+# Updates one user may have waiting behind their in-flight update; extra taps are dropped
+MAX_PENDING_UPDATES_PER_USER = 5
+BUSY_MESSAGE = "⏳ Still working on your previous request. Please try again in a moment."
+
+# Set inside a seller update's task so its handler can release the per-user order early
+current_user_order = contextvars.ContextVar("current_user_order", default=None)
+
+# Seconds an abandoned in-memory flow step (e.g. awaiting a phone number) is kept
+PENDING_ACTION_TTL = 600
+
+# Archives above this size are downloaded in 512 KB parts instead of Telethon's default
+LARGE_DOWNLOAD_BYTES = 1024 * 1024
+
+# TData archives up to this size are opened from memory instead of a temp file
+IN_MEMORY_ARCHIVE_BYTES = 32 * 1024 * 1024
+
+# Threads decompressing TData members in parallel (zlib releases the GIL)
+ARCHIVE_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+ARCHIVE_COPY_BUFFER = 1024 * 1024
+
+# Fields read by the seller onboarding steps; user documents carry much more
+SELLER_ONBOARDING_PROJECTION = {"temp_phone": 1, "temp_proxy_host": 1, "skip_proxy": 1}
+
+# The connection settings a Telethon proxy dict is built from
+SELLER_PROXY_PROJECTION = {
+    "_id": 0, "proxy_type": 1, "proxy_host": 1, "proxy_port": 1, "proxy_username": 1, "proxy_password": 1
+}
+
+OTP_SENT_MESSAGE = """✅ **OTP Sent Successfully!**
+
+📱 **Phone:** {phone}
+⏰ **Expires in:** 5 minutes
+
+Please enter the verification code you received:"""
+
+OTP_RESENT_MESSAGE = """✅ **New OTP Sent!**
+
+📱 **Phone:** {phone}
+⏰ **Expires in:** 5 minutes
+
+Please enter the new verification code:"""
+
+OTP_SEND_FAILED_MESSAGE = """❌ **Failed to Send OTP**
+
+{error}
+
+Please try again with a valid phone number."""
+
+OTP_VERIFY_FAILED_MESSAGE = """❌ **OTP Verification Failed**
+
+{error}
+
+Please try again."""
+
+ALREADY_VERIFYING_MESSAGE = """⏳ **Already Verifying...**
+
+Your code is being checked. Please wait for the result."""
+
+PASSWORD_VERIFY_FAILED_MESSAGE = """❌ **Password Verification Failed**
+
+{error}"""
+
+OTP_ACCOUNT_ADDED_MESSAGE = """✅ **Account Added Successfully!**
+
+👤 **Username:** @{username}
+📱 **Phone:** {phone}
+🎆 **Premium:** {premium}"""
+
+TFA_ACCOUNT_ADDED_MESSAGE = """✅ **Account Added with 2FA!**
+
+👤 **Username:** @{username}
+📱 **Phone:** {phone}
+🔐 **2FA:** Enabled"""
+
+VERIFICATION_COMPLETE_MESSAGE = """✅ **Automated Checks Complete!**
+
+🔓 **Frozen Status:** Not Frozen
+📊 **Quality Score:** {quality_score}/100
+🔍 **Verification Score:** {verification_score:.1f}%
+🚫 **Spam Status:** {spam_status}
+
+⏳ **Status:** Pending admin review
+
+Your account has been sent to admin for manual verification. You'll be notified once approved!"""
+
+UPLOAD_LIMIT_MESSAGE = "❌ **Daily Upload Limit Reached**\n\nYou can upload maximum {max_uploads} accounts per day.\nTry again tomorrow."
+
+INVALID_PHONE_MESSAGE = "❌ **Invalid Phone Number**\n\nPlease use international format with country code.\nExample: +1234567890"
+
+SELLER_STATS_TEMPLATE = """📊 **Your Seller Statistics**
+
+📤 **Total Uploaded:** {total}
+✅ **Approved:** {approved}
+💰 **Sold:** {sold}
+💵 **Current Balance:** ${balance:.2f}
+
+📈 **Success Rate:** {success_rate:.1f}%
+💎 **Conversion Rate:** {conversion_rate:.1f}%"""
+
+SELLER_RATING_TEMPLATE = """⭐ **Your Seller Rating**
+
+🌟 **Current Rating:** {rating_text}
+
+**Rating Factors:**
+• Account approval rate: {approval_rate:.1f}%
+• Sales conversion rate: {conversion_rate:.1f}%
+• Account quality scores
+• Customer feedback
+
+**Tips to Improve:**
+• Upload high-quality accounts
+• Ensure accounts have clean history
+• Provide accurate information
+• Maintain good account standards"""
+
+WELCOME_MESSAGE = """🔥 **Welcome to Telegram Account Marketplace - Seller Bot**
+
+Hello {first_name}! 👋
+
+This bot allows you to sell your Telegram accounts safely and securely.
+
+**How it works:**
+1. Upload your account session OR use Phone + OTP
+2. Automated verification checks
+3. Admin review and approval
+4. Account listed for sale
+5. Get paid when sold!
+
+**Two Ways to Sell:**
+📤 **Session Upload**: Upload session files/strings
+📱 **Phone + OTP**: Verify ownership via phone number
+
+Ready to start selling?
+"""
+
+SELL_VIA_OTP_MESSAGE = """📱 **Sell Account via Phone + OTP**
+
+**Process:**
+1. Enter your account's phone number
+2. Receive OTP on your phone
+3. Enter OTP to verify ownership
+4. Automated verification checks
+5. Admin review and approval
+6. Account listed for sale
+
+**Requirements:**
+✅ Active Telegram account
+✅ Access to phone number
+✅ Ability to receive SMS/calls
+
+Ready to start?
+"""
+
+PHONE_PROMPT_MESSAGE = """📱 **Enter Your Phone Number**
+
+Please enter the phone number of the Telegram account you want to sell.
+
+**Format Examples:**
+• +1234567890 (US)
+• +91987654321 (India)
+• +447123456789 (UK)
+
+**Important:**
+• Use international format with country code
+• This must be the phone number of your Telegram account
+• You will receive an OTP on this number
+
+Send your phone number:
+"""
+
+HELP_MESSAGE = """❓ **Help & Support**
+
+**How to Sell Accounts:**
+1. Click 'Upload Account' or 'Sell via OTP'
+2. Provide session file/string or phone number
+3. Complete verification process
+4. Wait for admin approval
+5. Get paid when account sells!
+
+**Upload Methods:**
+📤 **Session Upload**: Upload .session files or session strings
+📱 **Phone + OTP**: Verify ownership via phone number
+
+**Account Requirements:**
+✅ Must be your own account
+✅ Clean history (no spam/bans)
+✅ Active and accessible
+✅ No illegal activity
+
+**Payment:**
+💰 Earnings added to your balance
+💸 Request payout via UPI or Crypto
+⏰ Payouts processed within 24 hours
+
+**Need More Help?**
+Contact our support team for assistance."""
+
+
 class SellerBot(BaseBot):
     def __init__(self, api_id: int, api_hash: str, bot_token: str, db_connection, otp_service=None, bulk_service=None, ml_service=None, security_service=None, social_service=None):
         super().__init__(api_id, api_hash, bot_token, db_connection, "Seller")
@@ -36,6 +324,19 @@ class SellerBot(BaseBot):
         self.otp_service = OtpService(api_id, api_hash)
         # Account login service for session handling
         self.account_login_service = AccountLoginService(db_connection, api_id, api_hash)
+        # Accounts waiting for background verification, drained by a fixed worker pool
+        self.verification_queue = asyncio.Queue()
+        self.verification_workers = []
+        # Fire-and-forget callback acknowledgements, referenced until done
+        self.callback_ack_tasks = set()
+        # Short-lived flow steps keyed by user id; bounded and expiring so abandoned flows don't pile up
+        self.pending_actions = CacheService(max_entries=10000)
+        # Per-user ordering: user id -> lock, and user id -> updates holding or waiting on it
+        self.user_locks = {}
+        self.user_backlog = {}
+        # Handlers that released the per-user order and finish in the background
+        self.detached_updates = set()
+        self._build_callback_tables()
     
     async def get_upload_limits(self):
         """Get upload limits from admin settings"""
@@ -57,48 +358,135 @@ class SellerBot(BaseBot):
         """Get security settings from admin settings"""
         return await self.settings_manager.get_setting("security_settings")
     
+    async def get_user_doc(self, user_id):
+        """Get a user document through a short-lived cache
+        
+        Only used for the seller-only onboarding fields (temp_phone, temp_proxy_host,
+        skip_proxy). State and balance are shared with the other bots, so read them directly.
+        """
+        cache_key = f"seller_user:{user_id}"
+        user_doc = cache_service.get(cache_key)
+        if user_doc is None:
+            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id}, SELLER_ONBOARDING_PROJECTION)
+            if user_doc:
+                cache_service.set(cache_key, user_doc, ttl_seconds=10)
+        return user_doc
+    
+    async def update_user(self, user_id, update, query=None):
+        """Update a user document and drop its cached copy"""
+        result = await self.db_connection.users.update_one(query or {"telegram_user_id": user_id}, update)
+        cache_service.delete(f"seller_user:{user_id}")
+        return result
+    
+    async def find_and_update_user(self, user_id, update, query=None, **kwargs):
+        """find_one_and_update a user document (pre-image by default) and drop its cached copy"""
+        user_doc = await self.db_connection.users.find_one_and_update(query or {"telegram_user_id": user_id}, update, **kwargs)
+        cache_service.delete(f"seller_user:{user_id}")
+        return user_doc
+    
     def register_handlers(self):
         """Register seller bot event handlers"""
         
-        @self.client.on(events.NewMessage)
-        async def all_messages_handler(event):
-            print(f"[SELLER] 📨 ANY MESSAGE: {event.text[:50] if event.text else 'No text'}")
-            logger.info(f"[SELLER] 📨 ANY MESSAGE RECEIVED: {event.text[:50] if event.text else 'No text'}")
-        
-        @self.client.on(events.NewMessage(pattern='/start'))
-        async def start_handler(event):
-            logger.info(f"[SELLER] /start handler triggered")
-            await self.handle_start(event)
-        
-        @self.client.on(events.NewMessage(pattern='/debug'))
-        async def debug_handler(event):
-            logger.info(f"[SELLER] /debug handler triggered")
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": event.sender_id})
-            state = user_doc.get('state') if user_doc else 'No state'
-            await event.respond(f"Seller bot is working! 🔥\n\nYour state: {state}\nUser ID: {event.sender_id}")
-        
         @self.client.on(events.CallbackQuery)
         async def callback_handler(event):
-            print(f"[SELLER] 🔔 CALLBACK: {event.data}")
-            logger.info(f"[SELLER] 🔔 CALLBACK RECEIVED: {event.data}")
-            await self.handle_callback(event)
+            # Acknowledge right away (Telegram allows ~15s), even if the user's earlier update is still running
+            ack_task = asyncio.create_task(self.answer_callback(event))
+            self.callback_ack_tasks.add(ack_task)
+            ack_task.add_done_callback(self.callback_ack_tasks.discard)
+            await self.run_in_user_order(event, self.handle_callback)
+        
+        @self.client.on(events.NewMessage)
+        async def message_handler(event):
+            await self.run_in_user_order(event, self.dispatch_message)
+    
+    async def run_in_user_order(self, event, handler):
+        """Run handler once the same user's earlier updates are done
         
-        @self.client.on(events.NewMessage(func=lambda e: e.document))
-        async def document_handler(event):
+        Telethon already runs each update in its own task, so users never wait
+        on each other; this only keeps one user's taps and messages in order.
+        Handlers call release_user_order() before slow I/O so the user's next
+        update (e.g. Cancel) is not held up behind a download or login.
+        """
+        user_id = event.sender_id
+        backlog = self.user_backlog.get(user_id, 0)
+        if backlog >= MAX_PENDING_UPDATES_PER_USER:
+            logger.warning("[SELLER] Dropping update from %s, %d already pending", user_id, backlog)
+            self.queue_message(event.chat_id, BUSY_MESSAGE)
+            return
+        
+        lock = self.user_locks.get(user_id)
+        if lock is None:
+            lock = self.user_locks[user_id] = asyncio.Lock()
+        self.user_backlog[user_id] = backlog + 1
+        try:
+            async with lock:
+                released = asyncio.Event()
+                handler_task = asyncio.create_task(self._run_ordered_handler(handler, event, released))
+                release_wait = asyncio.create_task(released.wait())
+                await asyncio.wait({handler_task, release_wait}, return_when=asyncio.FIRST_COMPLETED)
+                release_wait.cancel()
+                
+                if not handler_task.done():
+                    # Released early: the rest of the handler no longer blocks this user
+                    self.detached_updates.add(handler_task)
+                    handler_task.add_done_callback(self._finish_detached_update)
+                else:
+                    handler_task.result()
+        finally:
+            remaining = self.user_backlog[user_id] - 1
+            if remaining:
+                self.user_backlog[user_id] = remaining
+            else:
+                # Nobody holds or waits on the lock any more
+                del self.user_backlog[user_id]
+                del self.user_locks[user_id]
+    
+    @staticmethod
+    async def _run_ordered_handler(handler, event, released):
+        current_user_order.set(released)
+        await handler(event)
+    
+    @staticmethod
+    def release_user_order():
+        """Let the current user's next update start while this handler finishes its slow I/O"""
+        released = current_user_order.get()
+        if released is not None:
+            released.set()
+    
+    def _finish_detached_update(self, task):
+        self.detached_updates.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("[SELLER] Update handler failed after releasing its order: %r", task.exception())
+    
+    async def dispatch_message(self, event):
+        """Route a message to exactly one handler"""
+        if event.document is not None:
             await self.handle_document(event)
+            return
         
-        @self.client.on(events.NewMessage(func=lambda e: e.text and not e.text.startswith('/')))
-        async def text_handler(event):
-            print(f"[SELLER] 🔔 TEXT HANDLER: {event.text[:50]}")
-            logger.info(f"[SELLER] 🔔 TEXT HANDLER TRIGGERED for {event.sender_id}")
-            logger.info(f"[SELLER] 📝 Text content: {event.text[:100]}")
+        text = event.raw_text
+        if not text:
+            return
+        
+        if text.startswith('/start'):
+            logger.info("[SELLER] /start handler triggered")
+            await self.handle_start(event)
+        elif text.startswith('/debug'):
+            logger.info("[SELLER] /debug handler triggered")
+            await self.handle_debug(event)
+        elif not text.startswith('/'):
+            logger.info("[SELLER] 🔔 TEXT HANDLER TRIGGERED for %s", event.sender_id)
+            logger.debug("[SELLER] 📝 Text content: %.100s", text)
             try:
                 await self.handle_text(event)
             except Exception as e:
-                print(f"[SELLER] ERROR: {e}")
-                logger.error(f"[SELLER] ❌ Text handler crashed: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+                logger.exception("[SELLER] ❌ Text handler crashed: %s", e)
+    
+    async def handle_debug(self, event):
+        """Handle /debug command"""
+        user_doc = await self.db_connection.users.find_one({"telegram_user_id": event.sender_id}, {"state": 1})
+        state = user_doc.get('state') if user_doc else 'No state'
+        await event.respond(f"Seller bot is working! 🔥\n\nYour state: {state}\nUser ID: {event.sender_id}")
     
     async def handle_start(self, event):
         """Handle /start command"""
@@ -106,226 +494,226 @@ class SellerBot(BaseBot):
             logger.info(f"[SELLER] /start command received from user {event.sender_id}")
             user = await self.get_or_create_user(event)
             
-            # Clear any existing state on /start
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
-                {"$unset": {"state": "", "temp_phone": "", "temp_otp_code": ""}}
+            # Clear any existing state on /start; matches nothing (no write) when already clean
+            await self.update_user(
+                user.telegram_user_id,
+                {"$unset": {"state": "", "temp_phone": "", "temp_otp_code": ""}},
+                query={"telegram_user_id": user.telegram_user_id, "$or": [
+                    {"state": {"$exists": True}},
+                    {"temp_phone": {"$exists": True}},
+                    {"temp_otp_code": {"$exists": True}}
+                ]}
             )
             logger.info(f"[SELLER] Cleared state for user {user.telegram_user_id}")
             logger.info(f"[SELLER] Showing welcome message to {user.first_name} ({user.telegram_user_id})")
             
-            welcome_message = f"""
-🔥 **Welcome to Telegram Account Marketplace - Seller Bot**
-
-Hello {user.first_name}! 👋
-
-This bot allows you to sell your Telegram accounts safely and securely.
-
-**How it works:**
-1. Upload your account session OR use Phone + OTP
-2. Automated verification checks
-3. Admin review and approval
-4. Account listed for sale
-5. Get paid when sold!
-
-**Two Ways to Sell:**
-📤 **Session Upload**: Upload session files/strings
-📱 **Phone + OTP**: Verify ownership via phone number
-
-Ready to start selling?
-            """
-            
-            buttons = create_main_menu(is_seller=True)
-            logger.info(f"[SELLER] Main menu buttons: {buttons}")
-            await self.send_message(event.chat_id, welcome_message, buttons)
+            logger.info("[SELLER] Main menu buttons: %s", MAIN_MENU_KEYBOARD)
+            await self.send_message(event.chat_id, WELCOME_MESSAGE.format(first_name=user.first_name), MAIN_MENU_KEYBOARD)
             logger.info(f"[SELLER] Welcome message sent to {user.telegram_user_id}")
             
         except Exception as e:
             logger.error(f"[SELLER] Start handler error for {event.sender_id}: {str(e)}")
             await self.send_message(event.chat_id, "❌ An error occurred. Please try again.")
     
+    def _build_callback_tables(self):
+        """Build the callback dispatch tables; every handler takes (event, user, user_doc, data)"""
+        self._exact_callbacks = {
+            "upload_account": lambda event, user, user_doc, data: self.handle_upload_account(event, user),
+            "sell_via_otp": lambda event, user, user_doc, data: self.handle_sell_via_otp(event, user),
+            "use_phone_otp": lambda event, user, user_doc, data: self.handle_use_phone_otp(event, user),
+            "upload_session": lambda event, user, user_doc, data: self.handle_upload_account(event, user),
+            "my_balance": self._cb_my_balance,
+            "my_accounts": self._cb_my_accounts,
+            "request_payout": self._cb_request_payout,
+            "accept_tos": self._cb_accept_tos,
+            "cancel_upload": self._cb_cancel_upload,
+            "cancel_otp": self._cb_cancel_upload,
+            # handle_start clears the state when going back to main
+            "back_to_main": lambda event, user, user_doc, data: self.handle_start(event),
+            "seller_stats": lambda event, user, user_doc, data: self.handle_seller_stats(event, user),
+            "my_rating": lambda event, user, user_doc, data: self.handle_my_rating(event, user),
+            "help": lambda event, user, user_doc, data: self.handle_help(event),
+        }
+        # Keyed by the CALLBACK_PREFIX group
+        self._prefix_callbacks = {
+            "country": self._cb_country,
+            "resend_otp": self._cb_resend_otp,
+            "payout": self._cb_payout,
+            "add_proxy": self._cb_add_proxy,
+            "skip_proxy": self._cb_skip_proxy,
+            "skip_confirm": self._cb_skip_confirm,
+            "skip_cancel": self._cb_skip_cancel,
+        }
+    
     async def handle_callback(self, event):
         """Handle callback queries"""
         try:
             data = event.data.decode('utf-8')
-            logger.info(f"[SELLER] Callback received: '{data}' from user {event.sender_id}")
+            logger.info("[SELLER] Callback %r from user %s", data, event.sender_id)
             
-            # DEBUG: Check temp_phone BEFORE get_or_create_user
-            user_check = await self.db_connection.users.find_one({"telegram_user_id": event.sender_id})
-            print(f"[SELLER] CALLBACK START - temp_phone in DB: {user_check.get('temp_phone') if user_check else 'NO USER'}")
+            user, user_doc = await self.get_or_create_user_with_doc(event)
             
-            user = await self.get_or_create_user(event)
+            handler = self._exact_callbacks.get(data)
+            if handler is None:
+                prefix_match = CALLBACK_PREFIX.match(data)
+                if prefix_match:
+                    handler = self._prefix_callbacks[prefix_match.group(1)]
             
-            # DEBUG: Check temp_phone AFTER get_or_create_user
-            user_check2 = await self.db_connection.users.find_one({"telegram_user_id": event.sender_id})
-            print(f"[SELLER] AFTER get_or_create_user - temp_phone in DB: {user_check2.get('temp_phone') if user_check2 else 'NO USER'}")
-            
-            if data == "upload_account":
-                await self.handle_upload_account(event, user)
-            elif data.startswith("country_"):
-                country = data.split("_", 1)[1]
-                await self.handle_country_selected(event, user, country)
-            elif data == "sell_via_otp":
-                logger.info(f"[SELLER] User {user.telegram_user_id} clicked 'Sell via OTP'")
-                await self.handle_sell_via_otp(event, user)
-            elif data == "use_phone_otp":
-                logger.info(f"[SELLER] User {user.telegram_user_id} clicked 'Use Phone + OTP'")
-                await self.handle_use_phone_otp(event, user)
-            elif data == "upload_session":
-                logger.info(f"[SELLER] User {user.telegram_user_id} clicked 'Upload Session'")
-                await self.handle_upload_account(event, user)
-            elif data == "my_balance":
-                user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
-                balance = user_doc.get("balance", 0.0) if user_doc else 0.0
-                await self.edit_message(event, f"💰 **Your Balance: ${balance:.2f}**", [[Button.inline("💸 Request Payout", "request_payout"), Button.inline("🔙 Back", "back_to_main")]])
-            elif data == "my_accounts":
-                accounts = await self.db_connection.accounts.find({"seller_id": user.telegram_user_id}).sort("created_at", -1).to_list(length=10)
-                if not accounts:
-                    await self.edit_message(event, "📊 **Your Accounts**\n\nYou haven't uploaded any accounts yet.", [[Button.inline("📤 Upload Account", "upload_account"), Button.inline("🔙 Back", "back_to_main")]])
-                    return
-                
-                accounts_message = "📊 **Your Accounts**\n\n"
-                for account in accounts:
-                    status_emoji = {"pending": "⏳", "checking": "🔍", "approved": "✅", "rejected": "❌", "sold": "💰"}.get(account["status"], "❓")
-                    username = account.get("username", "No username")
-                    accounts_message += f"{status_emoji} **{username}** - {account['status'].title()}\n"
-                
-                await self.edit_message(event, accounts_message, [[Button.inline("📤 Upload Another", "upload_account"), Button.inline("🔙 Back", "back_to_main")]])
-            elif data == "request_payout":
-                user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
-                balance = user_doc.get("balance", 0.0) if user_doc else 0.0
-                if balance <= 0:
-                    await self.edit_message(event, "💸 **Request Payout**\n\n❌ You don't have any balance to withdraw.", [[Button.inline("🔙 Back", "back_to_main")]])
-                    return
-                
-                await self.edit_message(event, f"💸 **Request Payout**\n\n💰 **Available Balance: ${balance:.2f}**\n\nChoose your preferred payout method:", [[Button.inline("💳 UPI Payout", "payout_upi"), Button.inline("₿ Crypto Payout", "payout_crypto")], [Button.inline("🔙 Back", "back_to_main")]])
-            elif data == "accept_tos":
-                await self.db_connection.users.update_one({"telegram_user_id": user.telegram_user_id}, {"$set": {"tos_accepted": utc_now()}})
-                # Check what flow user came from
-                user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
-                if user_doc and user_doc.get("temp_flow") == "otp":
-                    # Continue with OTP flow
-                    await self.db_connection.users.update_one({"telegram_user_id": user.telegram_user_id}, {"$unset": {"temp_flow": ""}})
-                    await self.handle_sell_via_otp(event, user)
-                else:
-                    # Continue with upload flow
-                    await self.edit_message(event, "📤 **Upload Account**\n\nPlease send your session file or session string.", [[Button.inline("🔙 Back", "back_to_main")]])
-                    await self.db_connection.users.update_one({"telegram_user_id": user.telegram_user_id}, {"$set": {"state": "awaiting_upload"}})
-            elif data == "cancel_upload" or data == "cancel_otp":
-                await self.db_connection.users.update_one({"telegram_user_id": event.sender_id}, {"$unset": {"state": "", "temp_phone": "", "temp_otp": ""}})
-                buttons = create_main_menu(is_seller=True)
-                await self.edit_message(event, "Upload cancelled. What would you like to do?", buttons)
-            elif data.startswith("resend_otp_"):
-                user_id = int(data.split("_", 2)[2])
-                user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id})
-                if not user_doc or not user_doc.get("temp_phone"):
-                    await self.edit_message(event, "❌ **No Phone Number Found**\n\nPlease start the process again.", [[Button.inline("🔙 Back", "back_to_main")]])
-                    return
-                
-                phone_number = user_doc["temp_phone"]
-                otp_result = await self.otp_service.verify_account_ownership(phone_number, user_id)
-                
-                if otp_result['success']:
-                    await self.edit_message(event, f"✅ **New OTP Sent!**\n\n📱 **Phone:** {phone_number}\n⏰ **Expires in:** 5 minutes\n\nPlease enter the new verification code:", buttons=create_otp_verification_keyboard(user_id))
-                else:
-                    await self.edit_message(event, f"❌ **Failed to Resend OTP**\n\n{otp_result['error']}", [[Button.inline("🔙 Back", "back_to_main")]])
-            elif data.startswith("payout_"):
-                method = data.split("_")[1]
-                user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
-                balance = user_doc.get("balance", 0.0) if user_doc else 0.0
-                
-                if method == "upi":
-                    payout_message = f"💳 **UPI Payout Request**\n\n💰 **Amount: ${balance:.2f}**\n\nPlease provide your UPI ID:"
-                else:
-                    payout_message = f"₿ **Crypto Payout Request**\n\n💰 **Amount: ${balance:.2f}**\n\nPlease provide your wallet address:"
-                
-                await self.edit_message(event, payout_message, [[Button.inline("🔙 Cancel", "request_payout")]])
-                await self.db_connection.users.update_one({"telegram_user_id": user.telegram_user_id}, {"$set": {"state": f"payout_{method}"}})
-            elif data == "back_to_main":
-                logger.info(f"[SELLER] User {user.telegram_user_id} clicked 'Back to Main'")
-                # Clear state when going back to main
-                await self.db_connection.users.update_one(
-                    {"telegram_user_id": user.telegram_user_id},
-                    {"$unset": {"state": "", "temp_phone": "", "temp_otp_code": ""}}
-                )
-                await self.handle_start(event)
-            elif data == "seller_stats":
-                await self.handle_seller_stats(event, user)
-            elif data == "my_rating":
-                await self.handle_my_rating(event, user)
-            elif data == "help":
-                await self.handle_help(event)
-            elif data.startswith("add_proxy_"):
-                parts = data.split("_")
-                logger.info(f"[SELLER] add_proxy callback - parts: {parts}")
-                if len(parts) >= 3:
-                    if parts[2] == "upload":
-                        country = parts[3] if len(parts) > 3 else "OTHER"
-                        await self.handle_add_proxy_upload(event, user, country)
-                    elif parts[2] == "otp":
-                        country = parts[3] if len(parts) > 3 else "OTHER"
-                        logger.info(f"[SELLER] Calling handle_add_proxy_otp for country={country}")
-                        await self.handle_add_proxy_otp(event, user, country)
-                    else:
-                        account_id = parts[2]
-                        await self.handle_add_proxy(event, user, account_id)
-            elif data.startswith("skip_proxy_"):
-                parts = data.split("_")
-                if len(parts) >= 3:
-                    if parts[2] == "upload":
-                        country = parts[3] if len(parts) > 3 else "OTHER"
-                        await self.handle_skip_proxy_upload(event, user, country)
-                    elif parts[2] == "otp":
-                        country = parts[3] if len(parts) > 3 else "OTHER"
-                        await self.handle_skip_proxy_otp(event, user, country)
-                    else:
-                        account_id = parts[2]
-                        await self.handle_skip_proxy_confirm(event, user, account_id)
-            elif data.startswith("skip_confirm_"):
-                parts = data.split("_")
-                if len(parts) >= 3:
-                    if parts[2] == "upload":
-                        country = parts[3] if len(parts) > 3 else "OTHER"
-                        await self.handle_skip_confirm_upload(event, user, country)
-                    elif parts[2] == "otp":
-                        country = parts[3] if len(parts) > 3 else "OTHER"
-                        await self.handle_skip_confirm_otp(event, user, country)
-                    else:
-                        account_id = parts[2]
-                        await self.handle_skip_proxy_final(event, user, account_id)
-            elif data.startswith("skip_cancel_"):
-                account_id = data.split("_", 2)[2]
-                await self.show_proxy_prompt(event.chat_id, user.telegram_user_id, account_id)
+            if handler:
+                await handler(event, user, user_doc, data)
             else:
-                logger.warning(f"[SELLER] Unknown callback data: '{data}' from user {event.sender_id}")
-            
-            try:
-                await self.answer_callback(event)
-            except Exception:
-                pass  # Ignore callback answer errors
+                logger.warning("[SELLER] Unknown callback data %r from user %s", data, event.sender_id)
             
         except Exception as e:
-            logger.error(f"[SELLER] Callback handler error for {event.sender_id}: {str(e)}")
-            try:
-                await self.answer_callback(event, "❌ An error occurred", alert=True)
-            except Exception:
-                pass  # Ignore callback answer errors
+            logger.error("[SELLER] Callback handler error for %s: %s", event.sender_id, e)
+            # The query is already answered, so report the error in the chat instead of an alert
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
+    
+    async def _cb_my_balance(self, event, user, user_doc, data):
+        balance = user_doc.get("balance", 0.0) if user_doc else 0.0
+        await self.edit_message(event, f"💰 **Your Balance: ${balance:.2f}**", BALANCE_KEYBOARD)
+    
+    async def _cb_my_accounts(self, event, user, user_doc, data):
+        # Served by the (seller_id, created_at) index: for sellers with no accounts this is a
+        # single empty index seek, so a separate existence check would only add a round-trip
+        accounts = await self.db_connection.accounts.aggregate([
+            {"$match": {"seller_id": user.telegram_user_id}},
+            {"$sort": {"created_at": -1}},
+            {"$limit": 10},
+            {"$project": {"_id": 0, "line": MY_ACCOUNTS_LINE}}
+        ], hint=[("seller_id", 1), ("created_at", -1)]).to_list(length=10)
+        if not accounts:
+            await self.edit_message(event, "📊 **Your Accounts**\n\nYou haven't uploaded any accounts yet.", NO_ACCOUNTS_KEYBOARD)
+            return
+        
+        lines = ["📊 **Your Accounts**", ""]
+        lines.extend(account["line"] for account in accounts)
+        accounts_message = "\n".join(lines)
+        
+        await self.edit_message(event, accounts_message, MY_ACCOUNTS_KEYBOARD)
+    
+    async def _cb_request_payout(self, event, user, user_doc, data):
+        balance = user_doc.get("balance", 0.0) if user_doc else 0.0
+        if balance <= 0:
+            await self.edit_message(event, "💸 **Request Payout**\n\n❌ You don't have any balance to withdraw.", BACK_KEYBOARD)
+            return
+        
+        await self.edit_message(event, f"💸 **Request Payout**\n\n💰 **Available Balance: ${balance:.2f}**\n\nChoose your preferred payout method:", PAYOUT_METHODS_KEYBOARD)
+    
+    async def _cb_accept_tos(self, event, user, user_doc, data):
+        # Accept ToS, clear temp_flow and (for the upload flow) await the upload in one write;
+        # the pre-image tells us which flow the user came from
+        previous_doc = await self.find_and_update_user(
+            user.telegram_user_id,
+            [
+                {"$set": {
+                    "tos_accepted": utc_now(),
+                    "state": {"$cond": [{"$eq": ["$temp_flow", "otp"]}, "$state", "awaiting_upload"]}
+                }},
+                {"$unset": "temp_flow"}
+            ],
+            projection={"temp_flow": 1}
+        )
+        if previous_doc and previous_doc.get("temp_flow") == "otp":
+            # Continue with OTP flow
+            await self.handle_sell_via_otp(event, user)
+        else:
+            # Continue with upload flow
+            await self.edit_message(event, "📤 **Upload Account**\n\nPlease send your session file or session string.", BACK_KEYBOARD)
+    
+    async def _cb_cancel_upload(self, event, user, user_doc, data):
+        self.pending_actions.delete(event.sender_id)
+        await self.update_user(event.sender_id, {"$unset": {"state": "", "temp_phone": "", "temp_otp": ""}})
+        await self.edit_message(event, "Upload cancelled. What would you like to do?", MAIN_MENU_KEYBOARD)
+    
+    async def _cb_country(self, event, user, user_doc, data):
+        country = data.split("_", 1)[1]
+        await self.handle_country_selected(event, user, country)
+    
+    async def _cb_resend_otp(self, event, user, user_doc, data):
+        user_id = int(data.split("_", 2)[2])
+        if user_id != user.telegram_user_id:
+            user_doc = await self.get_user_doc(user_id)
+        if not user_doc or not user_doc.get("temp_phone"):
+            await self.edit_message(event, "❌ **No Phone Number Found**\n\nPlease start the process again.", BACK_KEYBOARD)
+            return
+        
+        phone_number = user_doc["temp_phone"]
+        otp_result = await self.otp_service.verify_account_ownership(phone_number, user_id)
+        
+        if otp_result['success']:
+            await self.edit_message(event, OTP_RESENT_MESSAGE.format(phone=phone_number), buttons=create_otp_verification_keyboard(user_id))
+        else:
+            await self.edit_message(event, f"❌ **Failed to Resend OTP**\n\n{otp_result['error']}", BACK_KEYBOARD)
+    
+    async def _cb_payout(self, event, user, user_doc, data):
+        method = data.split("_")[1]
+        # Enter the payout state and read the current balance in one round-trip
+        payout_doc = await self.find_and_update_user(
+            user.telegram_user_id, {"$set": {"state": f"payout_{method}"}}, projection={"balance": 1}
+        )
+        balance = payout_doc.get("balance", 0.0) if payout_doc else 0.0
+        
+        if method == "upi":
+            payout_message = f"💳 **UPI Payout Request**\n\n💰 **Amount: ${balance:.2f}**\n\nPlease provide your UPI ID:"
+        else:
+            payout_message = f"₿ **Crypto Payout Request**\n\n💰 **Amount: ${balance:.2f}**\n\nPlease provide your wallet address:"
+        
+        await self.edit_message(event, payout_message, PAYOUT_CANCEL_KEYBOARD)
+    
+    async def _route_proxy_callback(self, event, user, data, upload_handler, otp_handler, account_handler):
+        """Route '<action>_upload_<country>', '<action>_otp_<country>' and '<action>_<account_id>' callbacks"""
+        parts = data.split("_")
+        if len(parts) < 3:
+            return
+        
+        if parts[2] == "upload":
+            country = parts[3] if len(parts) > 3 else "OTHER"
+            await upload_handler(event, user, country)
+        elif parts[2] == "otp":
+            country = parts[3] if len(parts) > 3 else "OTHER"
+            await otp_handler(event, user, country)
+        else:
+            account_id = parts[2]
+            await account_handler(event, user, account_id)
+    
+    async def _cb_add_proxy(self, event, user, user_doc, data):
+        await self._route_proxy_callback(
+            event, user, data, self.handle_add_proxy_upload, self.handle_add_proxy_otp, self.handle_add_proxy
+        )
+    
+    async def _cb_skip_proxy(self, event, user, user_doc, data):
+        await self._route_proxy_callback(
+            event, user, data, self.handle_skip_proxy_upload, self.handle_skip_proxy_otp, self.handle_skip_proxy_confirm
+        )
+    
+    async def _cb_skip_confirm(self, event, user, user_doc, data):
+        await self._route_proxy_callback(
+            event, user, data, self.handle_skip_confirm_upload, self.handle_skip_confirm_otp, self.handle_skip_proxy_final
+        )
+    
+    async def _cb_skip_cancel(self, event, user, user_doc, data):
+        account_id = data.split("_", 2)[2]
+        await self.show_proxy_prompt(event.chat_id, user.telegram_user_id, account_id)
     
     async def handle_sell_via_otp(self, event, user):
         """Handle sell via OTP option"""
         try:
+            # Both settings are independent; fetch them together
+            general_settings, upload_limits = await asyncio.gather(
+                self.get_general_settings(), self.get_upload_limits()
+            )
+            
             # Check if maintenance mode is enabled
-            general_settings = await self.get_general_settings()
             if general_settings.get('maintenance_mode', False):
                 await self.edit_message(
                     event,
                     "🔧 **Maintenance Mode**\n\nThe system is currently under maintenance.\nPlease try again later.",
-                    [[Button.inline("🔙 Back", "back_to_main")]]
+                    BACK_KEYBOARD
                 )
                 return
             
             # Check daily upload limit (admin managed)
-            upload_limits = await self.get_upload_limits()
             if upload_limits.get('enabled', False):
                 max_uploads = upload_limits.get('max_per_day', 999)
                 today = utc_now().date()
@@ -333,8 +721,8 @@ Ready to start selling?
                     if user.upload_count_today >= max_uploads:
                         await self.edit_message(
                             event,
-                            f"❌ **Daily Upload Limit Reached**\n\nYou can upload maximum {max_uploads} accounts per day.\nTry again tomorrow.",
-                            [[Button.inline("🔙 Back", "back_to_main")]]
+                            UPLOAD_LIMIT_MESSAGE.format(max_uploads=max_uploads),
+                            BACK_KEYBOARD
                         )
                         return
             
@@ -342,30 +730,7 @@ Ready to start selling?
             # ToS will be handled per method if needed
             
             # Show OTP flow directly - no need for method selection
-            otp_message = """
-📱 **Sell Account via Phone + OTP**
-
-**Process:**
-1. Enter your account's phone number
-2. Receive OTP on your phone
-3. Enter OTP to verify ownership
-4. Automated verification checks
-5. Admin review and approval
-6. Account listed for sale
-
-**Requirements:**
-✅ Active Telegram account
-✅ Access to phone number
-✅ Ability to receive SMS/calls
-
-Ready to start?
-            """
-            
-            buttons = [
-                [Button.inline("📱 Continue with Phone + OTP", "use_phone_otp")],
-                [Button.inline("🔙 Back", "back_to_main")]
-            ]
-            await self.edit_message(event, otp_message, buttons)
+            await self.edit_message(event, SELL_VIA_OTP_MESSAGE, SELL_VIA_OTP_KEYBOARD)
             
         except Exception as e:
             logger.error(f"[SELLER] Sell via OTP handler error for {user.telegram_user_id}: {str(e)}")
@@ -376,38 +741,15 @@ Ready to start?
         try:
             user_id = event.sender_id
             
-            phone_message = """
-📱 **Enter Your Phone Number**
-
-Please enter the phone number of the Telegram account you want to sell.
-
-**Format Examples:**
-• +1234567890 (US)
-• +91987654321 (India)
-• +447123456789 (UK)
-
-**Important:**
-• Use international format with country code
-• This must be the phone number of your Telegram account
-• You will receive an OTP on this number
-
-Send your phone number:
-            """
-            
             # Use in-memory pending_actions
-            if not hasattr(self, 'pending_actions'):
-                self.pending_actions = {}
-            
-            self.pending_actions[user_id] = {
-                "action": "awaiting_phone_for_proxy"
-            }
+            self.pending_actions.set(user_id, {"action": "awaiting_phone_for_proxy"}, PENDING_ACTION_TTL)
             
             logger.info(f"[SELLER] Set pending_actions for {user_id}: awaiting_phone_for_proxy")
             
             await self.edit_message(
                 event,
-                phone_message,
-                [[Button.inline("🔙 Cancel", "cancel_otp")]]
+                PHONE_PROMPT_MESSAGE,
+                OTP_CANCEL_KEYBOARD
             )
             
         except Exception as e:
@@ -417,7 +759,6 @@ Send your phone number:
     async def handle_text(self, event):
         """Handle text messages (session strings, phone numbers, OTP codes)"""
         try:
-            print(f"[SELLER] handle_text called for {event.sender_id}")
             logger.info(f"[SELLER] ===== TEXT HANDLER CALLED =====")
             
             if not event.text:
@@ -425,125 +766,105 @@ Send your phone number:
             
             user_id = event.sender_id
             
-            # Check pending_actions first (in-memory state)
-            if not hasattr(self, 'pending_actions'):
-                self.pending_actions = {}
-            
+            # Check pending_actions first (in-memory state); a hit never touches Mongo
             pending_action = self.pending_actions.get(user_id)
             
-            logger.info(f"[SELLER] Checking pending_actions for {user_id}: {pending_action}")
+            logger.info("[SELLER] Checking pending_actions for %s: %s", user_id, pending_action)
             
             if pending_action and pending_action.get("action") == "awaiting_phone_for_proxy":
                 phone_text = str(event.text).strip()
-                self.pending_actions.pop(user_id, None)
+                self.pending_actions.delete(user_id)
                 
-                class UserObj:
-                    def __init__(self, uid):
-                        self.telegram_user_id = uid
-                user = UserObj(user_id)
+                user = UserRef(user_id)
                 
                 await self.handle_phone_for_proxy(event, user, phone_text)
                 return
             
             if pending_action and pending_action.get("action") == "awaiting_phone_otp":
                 phone_text = str(event.text).strip()
-                print(f"[SELLER] PHONE OTP FLOW - Phone: {phone_text}")
                 
                 # Clear pending action
-                self.pending_actions.pop(user_id, None)
+                self.pending_actions.delete(user_id)
                 
                 # Create minimal user object
-                class UserObj:
-                    def __init__(self, uid):
-                        self.telegram_user_id = uid
-                user = UserObj(user_id)
+                user = UserRef(user_id)
                 
                 await self.process_phone_number(event, user, phone_text)
                 return
             
-            # Fallback to database state
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id})
+            # Fallback to database state; a pending upload is consumed in the same round-trip
+            user_doc = await self.find_and_update_user(
+                user_id,
+                [{"$set": {"state": {"$cond": [{"$eq": ["$state", "awaiting_upload"]}, "$$REMOVE", "$state"]}}}],
+                projection={"state": 1}
+            )
             if not user_doc:
                 return
             
             state = user_doc.get("state")
-            print(f"[SELLER] DB state: {state}")
             
             if not state:
                 return
             
             if state == "awaiting_upload":
-                await self.db_connection.users.update_one({"telegram_user_id": user.telegram_user_id}, {"$unset": {"state": ""}})
+                # The state was consumed above; the login doesn't need to hold up the seller's next update
+                self.release_user_order()
                 processing_msg = await self.send_message(event.chat_id, "🔄 **Processing your session...**\n\nThis may take a few moments.")
                 
                 session_text = str(event.text).strip() if event.text else ""
                 if not session_text:
-                    await self.client.edit_message(event.chat_id, processing_msg.id, "❌ **Invalid Session**\n\nPlease provide a valid session string.")
+                    await self.edit_message_by_id(event.chat_id, processing_msg.id, "❌ **Invalid Session**\n\nPlease provide a valid session string.")
                     return
                 
                 # Use AccountLoginService to login and store
                 login_result = await self.account_login_service.login_and_store_account(
-                    session_text, user.telegram_user_id, "auto"
+                    session_text, user_id, "auto"
                 )
                 
                 if not login_result.get("success"):
                     error_msg = login_result.get("error", "Login failed")
-                    await self.client.edit_message(event.chat_id, processing_msg.id, f"❌ **Account Login Failed**\n\n{error_msg}")
+                    await self.edit_message_by_id(event.chat_id, processing_msg.id, f"❌ **Account Login Failed**\n\n{error_msg}")
                     return
                 
                 account_id = login_result["account_id"]
                 
                 # Show proxy prompt before verification
-                await self.client.edit_message(event.chat_id, processing_msg.id, "✅ **Session imported successfully!**")
-                await self.show_proxy_prompt(event.chat_id, user.telegram_user_id, account_id)
+                await self.edit_message_by_id(event.chat_id, processing_msg.id, "✅ **Session imported successfully!**")
+                await self.show_proxy_prompt(event.chat_id, user_id, account_id)
             
             if state == "awaiting_phone_otp":
                 phone_text = str(event.text).strip() if event.text else ""
-                print(f"[SELLER] PHONE OTP FLOW - Phone: {phone_text}")
                 logger.info(f"[SELLER] ===== PHONE OTP FLOW STARTED =====")
                 logger.info(f"[SELLER] User: {user_id}")
                 logger.info(f"[SELLER] Phone: {phone_text}")
                 logger.info(f"[SELLER] Chat ID: {event.chat_id}")
                 
                 if not phone_text:
-                    print(f"[SELLER] Invalid phone")
                     await self.send_message(event.chat_id, "❌ **Invalid Phone Number**\n\nPlease provide a valid phone number.")
                     return
                 
                 # Process the phone number
-                print(f"[SELLER] Calling process_phone_number...")
                 logger.info(f"[SELLER] Calling process_phone_number...")
                 try:
                     # Create minimal user object for compatibility
-                    class UserObj:
-                        def __init__(self, uid):
-                            self.telegram_user_id = uid
-                    user = UserObj(user_id)
+                    user = UserRef(user_id)
                     await self.process_phone_number(event, user, phone_text)
-                    print(f"[SELLER] process_phone_number completed")
                     logger.info(f"[SELLER] ===== PHONE OTP FLOW COMPLETED =====")
                 except Exception as phone_error:
-                    print(f"[SELLER] ERROR: {phone_error}")
-                    logger.error(f"[SELLER] Error in process_phone_number: {phone_error}")
-                    import traceback
-                    traceback.print_exc()
-                    logger.error(traceback.format_exc())
+                    logger.exception("[SELLER] Error in process_phone_number: %s", phone_error)
                     await self.send_message(event.chat_id, f"❌ Error processing phone: {str(phone_error)}")
             
             elif state == "awaiting_otp_code":
                 otp_text = str(event.text).strip() if event.text else ""
                 # Remove spaces and any non-digit characters from OTP
-                otp_clean = ''.join(filter(str.isdigit, otp_text))
+                otp_clean = NON_DIGITS.sub('', otp_text)
                 
                 logger.info(f"[SELLER] Processing OTP code from {user_id}: '{otp_text}' -> '{otp_clean}'")
                 if not otp_clean or len(otp_clean) < 4:
                     await self.send_message(event.chat_id, "❌ **Invalid OTP**\n\nPlease provide a valid OTP code (4-6 digits).")
                     return
                 # Create minimal user object for compatibility
-                class UserObj:
-                    def __init__(self, uid):
-                        self.telegram_user_id = uid
-                user = UserObj(user_id)
+                user = UserRef(user_id)
                 # Pass clean OTP (Telegram accepts both formats)
                 await self.process_otp_code(event, user, otp_clean)
             
@@ -554,17 +875,13 @@ Send your phone number:
                     await self.send_message(event.chat_id, "❌ **Invalid Password**\n\nPlease provide a valid 2FA password.")
                     return
                 # Create minimal user object for compatibility
-                class UserObj:
-                    def __init__(self, uid):
-                        self.telegram_user_id = uid
-                user = UserObj(user_id)
+                user = UserRef(user_id)
                 await self.process_2fa_password(event, user, password_text)
             
             elif state.startswith("payout_"):
                 method = state.split("_")[1]
-                await self.db_connection.users.update_one({"telegram_user_id": user_id}, {"$unset": {"state": ""}})
-                
-                user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id})
+                # Clear the state and read the balance in one round-trip
+                user_doc = await self.find_and_update_user(user_id, {"$unset": {"state": ""}}, projection={"balance": 1})
                 balance = user_doc.get("balance", 0.0) if user_doc else 0.0
                 
                 payout_details = str(event.text).strip() if event.text else ""
@@ -582,8 +899,10 @@ Send your phone number:
                     "created_at": utc_now()
                 }
                 
-                await self.db_connection.transactions.insert_one(transaction_data)
-                await self.send_message(event.chat_id, f"✅ **Payout Request Submitted**\n\n💰 **Amount:** ${balance:.2f}\n💳 **Method:** {method.upper()}\n📍 **Details:** {payout_details}\n\n⏳ **Status:** Pending admin approval", buttons=[[Button.inline("🔙 Back", "back_to_main")]])
+                await asyncio.gather(
+                    self.db_connection.transactions.insert_one(transaction_data),
+                    self.send_message(event.chat_id, f"✅ **Payout Request Submitted**\n\n💰 **Amount:** ${balance:.2f}\n💳 **Method:** {method.upper()}\n📍 **Details:** {payout_details}\n\n⏳ **Status:** Pending admin approval", buttons=BACK_KEYBOARD)
+                )
             
             elif state.startswith("awaiting_proxy_"):
                 parts = state.split("_")
@@ -601,18 +920,6 @@ Send your phone number:
         try:
             logger.info(f"[SELLER] Document received from user {event.sender_id}")
             user = await self.get_or_create_user(event)
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
-            
-            current_state = user_doc.get("state") if user_doc else None
-            logger.info(f"[SELLER] User {user.telegram_user_id} current state: {current_state}")
-            
-            if not user_doc or user_doc.get("state") != "awaiting_upload":
-                logger.info(f"[SELLER] Document received without awaiting_upload state - auto-setting state")
-                # Auto-set the state and process the document
-                await self.db_connection.users.update_one(
-                    {"telegram_user_id": user.telegram_user_id},
-                    {"$set": {"state": "awaiting_upload"}}
-                )
             
             file_name = "unknown"
             if event.document.attributes:
@@ -621,72 +928,133 @@ Send your phone number:
                         file_name = attr.file_name
                         break
             
-            # Check if it's a TData archive
-            if file_name.lower().endswith(('.zip', '.rar', '.7z')) and 'tdata' in file_name.lower():
-                temp_file = tempfile.mktemp(suffix='.zip')
-                await event.download_media(temp_file)
-                await self.handle_tdata_archive(event, user, temp_file)
+            is_tdata_archive = file_name.lower().endswith(('.zip', '.rar', '.7z')) and 'tdata' in file_name.lower()
+            if is_tdata_archive and not file_name.lower().endswith('.zip'):
+                await self.send_message(event.chat_id, "❌ **Unsupported Archive Format**\n\nOnly ZIP files are supported for TData.")
                 return
             
-            temp_file = tempfile.mktemp(suffix=os.path.splitext(file_name)[1])
-            await event.download_media(temp_file)
+            # Documents are accepted in any state: archives leave the user awaiting_upload,
+            # session files clear the state. One write, reading the old state for the log.
+            user_doc = await self.find_and_update_user(
+                user.telegram_user_id,
+                {"$set": {"state": "awaiting_upload"}} if is_tdata_archive else {"$unset": {"state": ""}},
+                projection={"state": 1}
+            )
+            current_state = user_doc.get("state") if user_doc else None
+            logger.info(f"[SELLER] User {user.telegram_user_id} state before document: {current_state}")
             
-            await self.db_connection.users.update_one({"telegram_user_id": user.telegram_user_id}, {"$unset": {"state": ""}})
-            processing_msg = await self.send_message(event.chat_id, "🔄 **Processing your session...**\n\nThis may take a few moments.")
+            # The state is settled; the download and import don't need to hold up the seller's next update
+            self.release_user_order()
             
-            # Use AccountLoginService to login and store
-            login_result = await self.account_login_service.login_and_store_account(
-                temp_file, user.telegram_user_id, "auto"
-            )
-            os.unlink(temp_file)
+            if is_tdata_archive:
+                await self.handle_tdata_archive(event, user)
+                return
+            
+            fd, temp_file = tempfile.mkstemp(suffix=os.path.splitext(file_name)[1])
+            os.close(fd)
+            try:
+                # Download while the user is acknowledged
+                _, processing_msg = await asyncio.gather(
+                    event.download_media(temp_file),
+                    self.send_message(event.chat_id, "🔄 **Processing your session...**\n\nThis may take a few moments.")
+                )
+                
+                # Use AccountLoginService to login and store
+                login_result = await self.account_login_service.login_and_store_account(
+                    temp_file, user.telegram_user_id, "auto"
+                )
+            finally:
+                try:
+                    os.unlink(temp_file)
+                except FileNotFoundError:
+                    pass
             
             if not login_result.get("success"):
                 error_msg = login_result.get("error", "Login failed")
-                await self.client.edit_message(event.chat_id, processing_msg.id, f"❌ **Account Login Failed**\n\n{error_msg}")
+                await self.edit_message_by_id(event.chat_id, processing_msg.id, f"❌ **Account Login Failed**\n\n{error_msg}")
                 return
             
             account_id = login_result["account_id"]
             
-            await self.client.edit_message(event.chat_id, processing_msg.id, "✅ **Session imported successfully!**")
+            await self.edit_message_by_id(event.chat_id, processing_msg.id, "✅ **Session imported successfully!**")
             
             # Start verification directly
-            import asyncio
-            asyncio.create_task(self.run_verification(account_id, event.chat_id))
+            self.start_verification(account_id, event.chat_id)
             
         except Exception as e:
             logger.error(f"Document handler error: {str(e)}")
             await self.send_message(event.chat_id, "❌ Failed to process file. Please try again.")
     
-    async def handle_tdata_archive(self, event, user, archive_path):
+    @staticmethod
+    def extract_tdata_folder(zip_ref, extract_path):
+        """Extract the folder containing key_datas from an open archive; returns its path or None"""
+        names = zip_ref.namelist()
+        key_datas = next((n for n in names if n.rsplit('/', 1)[-1] == 'key_datas'), None)
+        if not key_datas or zip_ref.getinfo(key_datas).file_size == 0:
+            return None
+        
+        root = key_datas.rsplit('/', 1)[0] + '/' if '/' in key_datas else ''
+        base_path = os.path.realpath(extract_path)
+        members = []
+        for info in zip_ref.infolist():
+            if not info.filename.startswith(root):
+                continue
+            # Refuse entries that would land outside the extraction directory (zip-slip)
+            target = os.path.realpath(os.path.join(base_path, info.filename))
+            if os.path.commonpath([base_path, target]) != base_path:
+                raise ValueError(f"Unsafe path in archive: {info.filename}")
+            # Directories are created up front so the workers only write files
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                members.append((info, target))
+        
+        def extract_member(member):
+            info, target = member
+            # ZipFile serializes the underlying reads; decompression runs in parallel
+            with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, ARCHIVE_COPY_BUFFER)
+        
+        with ThreadPoolExecutor(max_workers=ARCHIVE_EXTRACT_WORKERS) as pool:
+            list(pool.map(extract_member, members))
+        
+        return os.path.normpath(os.path.join(base_path, root))
+    
+    @classmethod
+    def extract_tdata_archive(cls, archive, extract_path):
+        """Open a ZIP archive (path or file object) and extract its tdata folder; blocking"""
+        with zipfile.ZipFile(archive, 'r', allowZip64=True) as zip_ref:
+            return cls.extract_tdata_folder(zip_ref, extract_path)
+    
+    async def download_archive(self, document, temp_dir):
+        """Download a ZIP archive into memory, or into temp_dir when it is too large"""
+        # Largest part size Telegram allows: fewer round-trips for multi-MB archives
+        part_size_kb = 512 if document.size > LARGE_DOWNLOAD_BYTES else None
+        if document.size <= IN_MEMORY_ARCHIVE_BYTES:
+            return io.BytesIO(await self.client.download_file(document, bytes, part_size_kb=part_size_kb))
+        
+        archive_path = os.path.join(temp_dir, "archive.zip")
+        await self.client.download_file(document, archive_path, part_size_kb=part_size_kb)
+        return archive_path
+    
+    async def handle_tdata_archive(self, event, user):
         """Handle TData archive upload"""
         try:
-            import zipfile
-            import tempfile
-            import shutil
-            
-            processing_msg = await self.send_message(event.chat_id, "📦 **Processing TData Archive...**\n\nExtracting and converting...")
-            
-            # Create temp directory for extraction
+            # Create temp directory for extraction (and for the archive itself if it is large)
             with tempfile.TemporaryDirectory() as temp_dir:
                 extract_path = os.path.join(temp_dir, "tdata")
                 
-                # Extract archive
-                if archive_path.lower().endswith('.zip'):
-                    with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                        zip_ref.extractall(extract_path)
-                else:
-                    await self.client.edit_message(event.chat_id, processing_msg.id, "❌ **Unsupported Archive Format**\n\nOnly ZIP files are supported for TData.")
-                    return
+                processing_msg, archive = await asyncio.gather(
+                    self.send_message(event.chat_id, "📦 **Processing TData Archive...**\n\nExtracting and converting..."),
+                    self.download_archive(event.document, temp_dir)
+                )
                 
-                # Look for tdata folder in extracted content
-                tdata_path = None
-                for root, dirs, files in os.walk(extract_path):
-                    if 'key_datas' in files:
-                        tdata_path = root
-                        break
+                # Extract only the tdata folder (the one holding key_datas), off the event loop
+                tdata_path = await asyncio.to_thread(self.extract_tdata_archive, archive, extract_path)
                 
                 if not tdata_path:
-                    await self.client.edit_message(event.chat_id, processing_msg.id, "❌ **Invalid TData Archive**\n\nNo valid TData structure found in archive.")
+                    await self.edit_message_by_id(event.chat_id, processing_msg.id, "❌ **Invalid TData Archive**\n\nNo valid TData structure found in archive.")
                     return
                 
                 # Use AccountLoginService to login and store TData
@@ -696,16 +1064,15 @@ Send your phone number:
                 
                 if not login_result.get("success"):
                     error_msg = login_result.get("error", "Login failed")
-                    await self.client.edit_message(event.chat_id, processing_msg.id, f"❌ **TData Login Failed**\n\n{error_msg}")
+                    await self.edit_message_by_id(event.chat_id, processing_msg.id, f"❌ **TData Login Failed**\n\n{error_msg}")
                     return
                 
                 account_id = login_result["account_id"]
                 
-                await self.client.edit_message(event.chat_id, processing_msg.id, "✅ **TData imported successfully!**")
+                await self.edit_message_by_id(event.chat_id, processing_msg.id, "✅ **TData imported successfully!**")
                 
                 # Start verification directly
-                import asyncio
-                asyncio.create_task(self.run_verification(account_id, event.chat_id))
+                self.start_verification(account_id, event.chat_id)
                 
         except Exception as e:
             logger.error(f"TData archive handler error: {str(e)}")
@@ -715,15 +1082,12 @@ Send your phone number:
         """Process phone number and send OTP - Simplified approach"""
         try:
             user_id = event.sender_id
-            print(f"[SELLER] process_phone_number: {phone_number} for {user_id}")
             logger.info(f"[SELLER] Processing phone number {phone_number} for user {user_id}")
             
             # Validate phone number format
-            if not phone_number.startswith('+') or len(phone_number) < 10:
-                await self.send_message(
-                    event.chat_id,
-                    "❌ **Invalid Phone Number**\n\nPlease use international format with country code.\nExample: +1234567890"
-                )
+            phone_number = normalize_phone(phone_number)
+            if not phone_number:
+                await self.send_message(event.chat_id, INVALID_PHONE_MESSAGE)
                 return
             
             # Show processing message
@@ -732,22 +1096,22 @@ Send your phone number:
                 "📱 **Sending OTP...**\n\nPlease wait while we send the verification code to your phone."
             )
             
-            # Clear state now
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user_id},
-                {"$unset": {"state": ""}}
+            # Clear state now and read the proxy choice in the same round-trip
+            user_doc = await self.find_and_update_user(
+                user_id,
+                {"$unset": {"state": ""}},
+                projection=SELLER_ONBOARDING_PROJECTION
             )
             
             # Get seller proxy if available
             seller_proxy = None
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id})
             
             # Check if temp_proxy_host exists (just added)
             if user_doc and user_doc.get("temp_proxy_host") and not user_doc.get("skip_proxy"):
                 proxy_doc = await self.db_connection.seller_proxies.find_one({
                     "seller_id": user_id,
                     "proxy_host": user_doc["temp_proxy_host"]
-                })
+                }, SELLER_PROXY_PROJECTION)
                 if proxy_doc:
                     seller_proxy = {
                         "proxy_type": proxy_doc["proxy_type"],
@@ -759,20 +1123,19 @@ Send your phone number:
                     logger.info(f"[SELLER] Using seller proxy: {seller_proxy['addr']}:{seller_proxy['port']}")
             
             # Use shared OTP service instance with seller proxy
-            print(f"[SELLER] Calling OTP service with proxy={'Yes' if seller_proxy else 'None'}...")
             if seller_proxy:
                 logger.info(f"[SELLER] Proxy details: {seller_proxy['proxy_type']}://{seller_proxy['addr']}:{seller_proxy['port']}")
             logger.info(f"Calling verify_account_ownership for {phone_number} with proxy={seller_proxy['addr'] if seller_proxy else 'None'}")
+            self.release_user_order()
             otp_result = await self.otp_service.verify_account_ownership(phone_number, user_id, seller_proxy)
-            print(f"[SELLER] OTP result: {otp_result.get('success')}")
-            logger.info(f"[SELLER] OTP result: {otp_result}")
+            logger.info("[SELLER] OTP result: %s", otp_result)
             
             if otp_result.get('success'):
-                success_message = f"✅ **OTP Sent Successfully!**\n\n📱 **Phone:** {phone_number}\n⏰ **Expires in:** 5 minutes\n\nPlease enter the verification code you received:"
+                success_message = OTP_SENT_MESSAGE.format(phone=phone_number)
                 
                 # Set user state for OTP input BEFORE editing message
-                await self.db_connection.users.update_one(
-                    {"telegram_user_id": user_id},
+                await self.update_user(
+                    user_id,
                     {"$set": {
                         "state": "awaiting_otp_code", 
                         "temp_phone": phone_number
@@ -780,7 +1143,7 @@ Send your phone number:
                 )
                 logger.info(f"[SELLER] State set to awaiting_otp_code for user {user_id}")
                 
-                await self.client.edit_message(
+                await self.edit_message_by_id(
                     event.chat_id,
                     processing_msg.id,
                     success_message,
@@ -789,50 +1152,64 @@ Send your phone number:
                 
             else:
                 error_msg = otp_result.get('error', 'Unknown error occurred')
-                await self.client.edit_message(
+                await self.edit_message_by_id(
                     event.chat_id,
                     processing_msg.id,
-                    f"❌ **Failed to Send OTP**\n\n{error_msg}\n\nPlease try again with a valid phone number."
+                    OTP_SEND_FAILED_MESSAGE.format(error=error_msg)
                 )
             
         except Exception as e:
-            logger.error(f"[SELLER] Phone processing error for {event.sender_id}: {str(e)}")
+            logger.exception(f"[SELLER] Phone processing error for {event.sender_id}: {str(e)}")
             await self.send_message(event.chat_id, f"❌ **Phone Processing Failed**\n\n{str(e)}\n\nPlease try again or use session upload.")
     
     async def process_otp_code(self, event, user, otp_code):
         """Process OTP code and verify account - Simplified approach"""
+        user_id = event.sender_id
+        reserved_at = None
         try:
-            user_id = event.sender_id
-            
-            # Show processing message
-            processing_msg = await self.send_message(
-                event.chat_id,
-                "🔍 **Verifying OTP...**\n\nPlease wait while we verify your code."
+            # Claim the OTP state atomically so a code sent twice is only verified once
+            user_doc = await self.find_and_update_user(
+                user_id,
+                {"$set": {"state": "verifying_otp"}},
+                query={"telegram_user_id": user_id, "state": "awaiting_otp_code"},
+                projection={"temp_phone": 1}
             )
+            if not user_doc:
+                await self.send_message(event.chat_id, ALREADY_VERIFYING_MESSAGE)
+                return
             
-            # Get phone number from user doc
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id})
-            phone_number = user_doc.get("temp_phone") if user_doc else None
-            
+            phone_number = user_doc.get("temp_phone")
             if not phone_number:
-                await self.client.edit_message(event.chat_id, processing_msg.id, "❌ **Session Expired**\n\nPhone number not found. Please start over.")
+                await self.update_user(user_id, {"$unset": {"state": ""}})
+                await self.send_message(event.chat_id, "❌ **Session Expired**\n\nPhone number not found. Please start over.")
                 return
             
-            # Verify OTP using shared service
-            verification_result = await self.otp_service.verify_otp_and_create_session(user_id, otp_code)
+            # Take today's upload slot before logging in, so no session is created for a seller over the limit
+            now = utc_now()
+            max_uploads = await self.get_max_uploads_per_day()
+            if not await self.reserve_upload_slot(user_id, now, max_uploads):
+                await self.update_user(user_id, {"$unset": {"state": "", "temp_phone": ""}})
+                await self.send_message(event.chat_id, UPLOAD_LIMIT_MESSAGE.format(max_uploads=max_uploads), BACK_KEYBOARD)
+                return
+            reserved_at = now
+            
+            # The state is claimed; a repeated code or a Cancel can be handled while Telegram answers
+            self.release_user_order()
+            
+            # Show processing message while the OTP is verified using shared service
+            processing_msg, verification_result = await asyncio.gather(
+                self.send_message(
+                    event.chat_id,
+                    "🔍 **Verifying OTP...**\n\nPlease wait while we verify your code."
+                ),
+                self.otp_service.verify_otp_and_create_session(user_id, otp_code)
+            )
             
             if verification_result.get('success'):
-                # Clear user state
-                await self.db_connection.users.update_one(
-                    {"telegram_user_id": user_id},
-                    {"$unset": {"state": "", "temp_phone": ""}}
-                )
-                
                 # Create account record
                 account_info = verification_result["account_info"]
                 
                 # Encrypt session before storing
-                from app.utils.encryption import encrypt_data
                 encrypted_session = encrypt_data(verification_result["session_string"])
                 
                 account_data = {
@@ -843,80 +1220,120 @@ Send your phone number:
                     "last_name": account_info.get("last_name"),
                     "phone_number": account_info.get("phone"),
                     "session_string": encrypted_session,
-                    "tfa_password": verification_result.get("tfa_password"),
+                    "tfa_password": encrypt_data(verification_result["tfa_password"]) if verification_result.get("tfa_password") else None,
                     "status": AccountStatus.PENDING,
-                    "created_at": utc_now(),
-                    "updated_at": utc_now(),
+                    "created_at": now,
+                    "updated_at": now,
                     "obtained_via": "otp"
                 }
                 
-                result = await self.db_connection.accounts.insert_one(account_data)
-                account_id = str(result.inserted_id)
-                
-                success_msg = f"✅ **Account Added Successfully!**\n\n👤 **Username:** @{account_info.get('username', 'N/A')}\n📱 **Phone:** {account_info.get('phone', 'Hidden')}\n🎆 **Premium:** {'Yes' if account_info.get('premium') else 'No'}"
+                success_msg = OTP_ACCOUNT_ADDED_MESSAGE.format(
+                    username=account_info.get('username', 'N/A'),
+                    phone=account_info.get('phone', 'Hidden'),
+                    premium='Yes' if account_info.get('premium') else 'No'
+                )
                 
-                await self.client.edit_message(event.chat_id, processing_msg.id, success_msg)
+                # Only confirm once the account is stored; a failed insert leaves the state retryable
+                result = await self.db_connection.accounts.with_options(write_concern=WriteConcern(w=1)).insert_one(account_data)
+                reserved_at = None  # The slot now belongs to the stored account
+                await asyncio.gather(
+                    self.update_user(user_id, {"$unset": {"state": "", "temp_phone": ""}}),
+                    self.edit_message_by_id(event.chat_id, processing_msg.id, success_msg)
+                )
+                self.invalidate_seller_stats(user_id)
                 
                 # Start verification directly
-                import asyncio
-                asyncio.create_task(self.run_verification(account_id, event.chat_id))
+                self.start_verification(result.inserted_id, event.chat_id, account_data)
                 
             elif verification_result.get('requires_password'):
                 tfa_msg = "🔐 **Two-Factor Authentication Required**\n\nYour account has 2FA enabled. Please enter your password:"
-                await self.client.edit_message(event.chat_id, processing_msg.id, tfa_msg, buttons=[[Button.inline("❌ Cancel", "cancel_otp")]])
-                
-                # Set state for 2FA password
-                await self.db_connection.users.update_one(
-                    {"telegram_user_id": user_id},
-                    {"$set": {"state": "awaiting_2fa_password", "temp_otp_code": otp_code}}
+                # Hand the slot back (the password step reserves its own) and wait for the password
+                release = self.release_upload_slot(
+                    user_id, reserved_at, {"state": "awaiting_2fa_password", "temp_otp_code": otp_code}
+                )
+                reserved_at = None
+                await asyncio.gather(
+                    release,
+                    self.edit_message_by_id(event.chat_id, processing_msg.id, tfa_msg, buttons=TFA_CANCEL_KEYBOARD)
                 )
                 return
                 
             else:
-                await self.client.edit_message(
-                    event.chat_id,
-                    processing_msg.id,
-                    f"❌ **OTP Verification Failed**\n\n{verification_result.get('error', 'Unknown error')}\n\nPlease try again."
+                # Hand the slot back and release the claim so the seller can retry the code
+                release = self.release_upload_slot(user_id, reserved_at, {"state": "awaiting_otp_code"})
+                reserved_at = None
+                await asyncio.gather(
+                    release,
+                    self.edit_message_by_id(
+                        event.chat_id,
+                        processing_msg.id,
+                        OTP_VERIFY_FAILED_MESSAGE.format(error=verification_result.get('error', 'Unknown error'))
+                    )
                 )
             
         except Exception as e:
-            logger.error(f"Process OTP code error: {str(e)}")
+            logger.exception(f"Process OTP code error: {str(e)}")
+            if reserved_at:
+                await self.release_upload_slot(user_id, reserved_at)
+            await self.find_and_update_user(
+                user_id,
+                {"$set": {"state": "awaiting_otp_code"}},
+                query={"telegram_user_id": user_id, "state": "verifying_otp"},
+                projection={"_id": 1}
+            )
             await self.send_message(event.chat_id, "❌ Failed to verify OTP. Please try again.")
     
     async def process_2fa_password(self, event, user, password):
         """Process 2FA password - Simplified approach"""
+        reserved_at = None
         try:
             user_id = user.telegram_user_id
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id})
+            # Read the pending 2FA state and clear it in the same round-trip; only the
+            # first of several identical submissions still finds the state to claim
+            user_doc = await self.find_and_update_user(
+                user_id,
+                {"$unset": {"state": "", "temp_phone": "", "temp_otp_code": ""}},
+                query={"telegram_user_id": user_id, "state": "awaiting_2fa_password"},
+                projection={"temp_otp_code": 1, "temp_phone": 1}
+            )
+            if not user_doc:
+                await self.send_message(event.chat_id, ALREADY_VERIFYING_MESSAGE)
+                return
+            
             temp_otp_code = user_doc.get("temp_otp_code")
             
             if not temp_otp_code:
                 await self.send_message(event.chat_id, "❌ Session expired. Please start over.")
                 return
             
-            processing_msg = await self.send_message(event.chat_id, "🔐 **Verifying Password...**")
-            
             # Get phone number from user doc
             phone_number = user_doc.get("temp_phone")
             if not phone_number:
-                await self.client.edit_message(event.chat_id, processing_msg.id, "❌ **Session Expired**\n\nPhone number not found. Please start over.")
+                await self.send_message(event.chat_id, "❌ **Session Expired**\n\nPhone number not found. Please start over.")
                 return
             
-            # Verify with password using shared service
-            verification_result = await self.otp_service.verify_otp_and_create_session(user_id, temp_otp_code, password)
+            # Take today's upload slot before logging in (the 2FA state was cleared above)
+            now = utc_now()
+            max_uploads = await self.get_max_uploads_per_day()
+            if not await self.reserve_upload_slot(user_id, now, max_uploads):
+                await self.send_message(event.chat_id, UPLOAD_LIMIT_MESSAGE.format(max_uploads=max_uploads), BACK_KEYBOARD)
+                return
+            reserved_at = now
+            
+            # The state is claimed; a repeated password or a Cancel can be handled while Telegram answers
+            self.release_user_order()
+            
+            # Show processing message while the password is verified using shared service
+            processing_msg, verification_result = await asyncio.gather(
+                self.send_message(event.chat_id, "🔐 **Verifying Password...**"),
+                self.otp_service.verify_otp_and_create_session(user_id, temp_otp_code, password)
+            )
             
             if verification_result.get('success'):
-                # Clear user state
-                await self.db_connection.users.update_one(
-                    {"telegram_user_id": user_id},
-                    {"$unset": {"state": "", "temp_phone": "", "temp_otp_code": ""}}
-                )
-                
                 # Create account record
                 account_info = verification_result["account_info"]
                 
                 # Encrypt session before storing
-                from app.utils.encryption import encrypt_data
                 encrypted_session = encrypt_data(verification_result["session_string"])
                 
                 account_data = {
@@ -927,124 +1344,107 @@ Send your phone number:
                     "last_name": account_info.get("last_name"),
                     "phone_number": account_info.get("phone"),
                     "session_string": encrypted_session,
-                    "tfa_password": password,
+                    "tfa_password": encrypt_data(password),
                     "status": AccountStatus.PENDING,
-                    "created_at": utc_now(),
-                    "updated_at": utc_now(),
+                    "created_at": now,
+                    "updated_at": now,
                     "obtained_via": "otp"
                 }
                 
-                result = await self.db_connection.accounts.insert_one(account_data)
-                account_id = str(result.inserted_id)
-                
-                success_msg = f"✅ **Account Added with 2FA!**\n\n👤 **Username:** @{account_info.get('username', 'N/A')}\n📱 **Phone:** {account_info.get('phone', 'Hidden')}\n🔐 **2FA:** Enabled"
+                success_msg = TFA_ACCOUNT_ADDED_MESSAGE.format(
+                    username=account_info.get('username', 'N/A'),
+                    phone=account_info.get('phone', 'Hidden')
+                )
                 
-                await self.client.edit_message(event.chat_id, processing_msg.id, success_msg)
+                # Only confirm once the account is stored
+                result = await self.db_connection.accounts.with_options(write_concern=WriteConcern(w=1)).insert_one(account_data)
+                reserved_at = None  # The slot now belongs to the stored account
+                await self.edit_message_by_id(event.chat_id, processing_msg.id, success_msg)
+                self.invalidate_seller_stats(user_id)
                 
                 # Start verification directly
-                import asyncio
-                asyncio.create_task(self.run_verification(account_id, event.chat_id))
+                self.start_verification(result.inserted_id, event.chat_id, account_data)
                 
             else:
-                error_msg = f"❌ **Password Verification Failed**\n\n{verification_result.get('error', 'Unknown error')}"
-                await self.client.edit_message(event.chat_id, processing_msg.id, error_msg)
+                # Hand the slot back and restore the 2FA state so the seller can retry the password
+                error_msg = PASSWORD_VERIFY_FAILED_MESSAGE.format(error=verification_result.get('error', 'Unknown error'))
+                release = self.release_upload_slot(
+                    user_id,
+                    reserved_at,
+                    {"state": "awaiting_2fa_password", "temp_phone": phone_number, "temp_otp_code": temp_otp_code}
+                )
+                reserved_at = None
+                await asyncio.gather(
+                    release,
+                    self.edit_message_by_id(event.chat_id, processing_msg.id, error_msg)
+                )
             
         except Exception as e:
-            logger.error(f"Process 2FA password error: {str(e)}")
+            logger.exception(f"Process 2FA password error: {str(e)}")
+            if reserved_at:
+                await self.release_upload_slot(user.telegram_user_id, reserved_at)
             await self.send_message(event.chat_id, "❌ Failed to verify password. Please try again.")
     
-    async def process_otp_account(self, event, user, verification_result, message_id):
-        """Process account obtained via OTP"""
-        try:
-            # Use event.sender_id directly
-            user_id = event.sender_id
-            
-            # Create account record
-            account_info = verification_result.get("account_info")
-            logger.info(f"Account info from verification: {account_info}")
-            
-            if not account_info:
-                logger.error("No account_info in verification result")
-                logger.error(f"Full verification result: {verification_result}")
-                error_msg = "❌ **Account Processing Failed**\n\nFailed to retrieve account information. Please try again."
-                if message_id:
-                    await self.client.edit_message(event.chat_id, message_id, error_msg)
-                else:
-                    await self.send_message(event.chat_id, error_msg)
-                return
-            
-            # Safely extract account info with defaults
-            account_data = {
-                "seller_id": user_id,
-                "telegram_account_id": account_info.get("id") if account_info else None,
-                "username": account_info.get("username") if account_info else None,
-                "first_name": account_info.get("first_name") if account_info else None,
-                "last_name": account_info.get("last_name") if account_info else None,
-                "phone_number": account_info.get("phone") if account_info else None,
-                "session_string": verification_result.get("session_string", ""),
-                "tfa_password": verification_result.get("tfa_password"),  # Store 2FA password for buyer
-                "status": AccountStatus.PENDING,
-                "created_at": utc_now(),
-                "updated_at": utc_now(),
-                "obtained_via": "otp"  # Mark as OTP-obtained
+    async def get_max_uploads_per_day(self):
+        """Admin-configured daily upload limit, or None when limits are disabled"""
+        upload_limits = await self.get_upload_limits()
+        return upload_limits.get('max_per_day', 999) if upload_limits.get('enabled', False) else None
+    
+    async def reserve_upload_slot(self, user_id, now, max_uploads=None):
+        """Atomically bump today's upload count; returns False if max_uploads is already reached.
+        
+        The count resets when the last upload was on an earlier day. A denied
+        reservation writes nothing.
+        """
+        today_str = now.strftime("%Y-%m-%d")
+        # Older documents only have last_upload_date
+        last_upload_day = {"$ifNull": [
+            "$last_upload_day",
+            {"$dateToString": {"date": "$last_upload_date", "format": "%Y-%m-%d"}}
+        ]}
+        uploads_today = {"$ifNull": ["$upload_count_today", 0]}
+        
+        query = {"telegram_user_id": user_id}
+        if max_uploads is not None:
+            query["$expr"] = {"$or": [
+                {"$ne": [last_upload_day, today_str]},
+                {"$lt": [uploads_today, max_uploads]}
+            ]}
+        
+        pipeline = [{
+            "$set": {
+                "upload_count_today": {
+                    "$cond": [{"$eq": [last_upload_day, today_str]}, {"$add": [uploads_today, 1]}, 1]
+                },
+                "last_upload_date": now,
+                "last_upload_day": today_str
             }
-            
-            # Save account
-            result = await self.db_connection.accounts.insert_one(account_data)
-            account_id = str(result.inserted_id)
-            
-            # Update user upload count
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user_id})
-            today = utc_now().date()
-            
-            if user_doc and user_doc.get("last_upload_date") and user_doc["last_upload_date"].date() == today:
-                upload_count = user_doc.get("upload_count_today", 0) + 1
-            else:
-                upload_count = 1
-            
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user_id},
-                {
-                    "$set": {
-                        "upload_count_today": upload_count,
-                        "last_upload_date": utc_now()
-                    }
-                }
-            )
-            
-            # Update success message with safe access
-            username = account_info.get('username', 'No username') if account_info else 'No username'
-            phone = account_info.get('phone', 'Hidden') if account_info else 'Hidden'
-            account_id_display = account_info.get('id', 'Unknown') if account_info else 'Unknown'
-            
-            success_msg = f"✅ **Account Verified Successfully!**\n\n👤 **Account:** {username}\n📱 **Phone:** {phone}\n🆔 **ID:** {account_id_display}\n\n🔍 **Starting automated verification...**\n\nThis will take 2-3 minutes to complete all security checks."
-            
-            if message_id:
-                await self.client.edit_message(event.chat_id, message_id, success_msg)
-            else:
-                await self.send_message(event.chat_id, success_msg)
-            
-            # Start verification in background
-            import asyncio
-            asyncio.create_task(self.run_verification(account_id, event.chat_id))
-            
-        except Exception as e:
-            logger.error(f"Process OTP account error: {str(e)}")
-            await self.send_message(event.chat_id, "❌ Failed to process account. Please try again.")
+        }]
+        
+        user_doc = await self.find_and_update_user(user_id, pipeline, projection={"_id": 1}, query=query)
+        return user_doc is not None
     
-
+    async def release_upload_slot(self, user_id, reserved_at, set_fields=None):
+        """Give back a slot taken by reserve_upload_slot at reserved_at, setting set_fields in the same write.
+        
+        Nothing is given back once the day has rolled over, since the count already restarted.
+        """
+        today_str = reserved_at.strftime("%Y-%m-%d")
+        fields = {
+            "upload_count_today": {"$cond": [
+                {"$and": [{"$eq": ["$last_upload_day", today_str]}, {"$gt": ["$upload_count_today", 0]}]},
+                {"$subtract": ["$upload_count_today", 1]},
+                "$upload_count_today"
+            ]}
+        }
+        for field, value in (set_fields or {}).items():
+            fields[field] = {"$literal": value}
+        
+        await self.update_user(user_id, [{"$set": fields}])
     
-    async def check_spam_status(self, session_string, chat_id):
+    async def check_spam_status(self, decrypted_session, chat_id):
         """Check spam status via @SpamBot and auto-submit appeal if needed"""
         try:
-            from telethon import TelegramClient
-            from telethon.sessions import StringSession
-            from app.utils.encryption import decrypt_data
-            import asyncio
-            
-            # Decrypt session
-            decrypted_session = decrypt_data(session_string)
-            
             # Create client
             client = TelegramClient(StringSession(decrypted_session), self.api_id, self.api_hash)
             await client.connect()
@@ -1114,16 +1514,9 @@ Send your phone number:
             logger.error(f"Spam check error: {str(e)}")
             return {"status": "error", "message": str(e)}
     
-    async def check_account_frozen(self, session_string, chat_id):
+    async def check_account_frozen(self, decrypted_session, chat_id):
         """Check if account is frozen by trying to send a message"""
         try:
-            from telethon import TelegramClient
-            from telethon.sessions import StringSession
-            from telethon.errors import UserDeactivatedError, AuthKeyUnregisteredError
-            from app.utils.encryption import decrypt_data
-            import asyncio
-            
-            decrypted_session = decrypt_data(session_string)
             client = TelegramClient(StringSession(decrypted_session), self.api_id, self.api_hash)
             
             try:
@@ -1160,27 +1553,51 @@ Send your phone number:
             logger.error(f"Frozen check error: {str(e)}")
             return {"is_frozen": False, "reason": f"Check failed: {str(e)}"}
     
-    async def run_verification(self, account_id, chat_id):
-        """Run automated verification checks and send to admin for manual review"""
+    def start_verification(self, account_id, chat_id, account_doc=None):
+        """Queue an account for background verification by the worker pool"""
+        self.verification_queue.put_nowait((account_id, chat_id, account_doc))
+        self.verification_workers = [w for w in self.verification_workers if not w.done()]
+        while len(self.verification_workers) < VERIFICATION_WORKERS:
+            self.verification_workers.append(asyncio.create_task(self._verification_worker()))
+    
+    async def _verification_worker(self):
+        """Run queued verifications one at a time; VERIFICATION_WORKERS of these run concurrently"""
+        while True:
+            account_id, chat_id, account_doc = await self.verification_queue.get()
+            try:
+                await self.run_verification(account_id, chat_id, account_doc)
+            except Exception as e:
+                logger.exception(f"Verification worker error for account {account_id}: {e}")
+            finally:
+                self.verification_queue.task_done()
+    
+    async def run_verification(self, account_id, chat_id, account_doc=None):
+        """Run automated verification checks and send to admin for manual review
+        
+        Callers that just inserted the account can pass the document to skip re-reading it.
+        """
+        checking_task = None
         try:
-            from bson import ObjectId
+            # Freshly inserted accounts arrive as ObjectId; callback and login-service paths pass strings
             if isinstance(account_id, str):
                 account_id = ObjectId(account_id)
             
-            account_doc = await self.db_connection.accounts.find_one({"_id": account_id})
+            if account_doc is None:
+                account_doc = await self.db_connection.accounts.find_one({"_id": account_id})
             if not account_doc:
                 return
             
-            # Update status to checking
-            await self.db_connection.accounts.update_one(
-                {"_id": account_id},
-                {"$set": {"status": AccountStatus.CHECKING, "updated_at": utc_now()}}
-            )
+            self.invalidate_seller_stats(account_doc.get("seller_id"))
             
+            # Only checks that outlast CHECKING_STATUS_DELAY get the intermediate CHECKING write
+            checking_task = asyncio.create_task(self._mark_checking_after_delay(account_id, utc_now()))
             await self.send_message(chat_id, "🔍 **Running Automated Checks...**\n\n1️⃣ Checking if account is frozen\n2️⃣ Spam check via @SpamBot\n3️⃣ Quality score analysis\n4️⃣ Security verification")
             
+            # Both checks log in with the same session; decrypt it once
+            decrypted_session = decrypt_data(account_doc["session_string"])
+            
             # 1. Check if account is frozen FIRST
-            frozen_check = await self.check_account_frozen(account_doc["session_string"], chat_id)
+            frozen_check = await self.check_account_frozen(decrypted_session, chat_id)
             
             if frozen_check.get("is_frozen"):
                 # Account is frozen - reject immediately
@@ -1205,12 +1622,8 @@ Send your phone number:
             await self.send_message(chat_id, "✅ Account is active (not frozen)")
             
             # 2. Check spam status via @SpamBot
-            spam_status = await self.check_spam_status(account_doc["session_string"], chat_id)
-            if spam_status:
-                await self.db_connection.accounts.update_one(
-                    {"_id": account_id},
-                    {"$set": {"spam_check_result": spam_status, "updated_at": utc_now()}}
-                )
+            spam_status = await self.check_spam_status(decrypted_session, chat_id)
+            account_doc["spam_check_result"] = spam_status
             
             # Get proxy if account uses one
             proxy = None
@@ -1221,7 +1634,7 @@ Send your phone number:
                     proxy_doc = await self.db_connection.seller_proxies.find_one({
                         "seller_id": seller_id,
                         "proxy_host": account_doc.get("proxy_host")
-                    })
+                    }, SELLER_PROXY_PROJECTION)
                     if proxy_doc:
                         proxy = {
                             "proxy_type": proxy_doc["proxy_type"],
@@ -1233,7 +1646,7 @@ Send your phone number:
                         logger.info(f"Using account proxy for verification: {proxy['addr']}:{proxy['port']}")
                 # Fallback: get any proxy for this seller
                 if not proxy:
-                    proxy_doc = await self.db_connection.seller_proxies.find_one({"seller_id": seller_id})
+                    proxy_doc = await self.db_connection.seller_proxies.find_one({"seller_id": seller_id}, SELLER_PROXY_PROJECTION)
                     if proxy_doc:
                         proxy = {
                             "proxy_type": proxy_doc["proxy_type"],
@@ -1254,6 +1667,7 @@ Send your phone number:
                     "checks": verification_result.get("checks", {}),
                     "verification_logs": verification_result.get("logs", []),
                     "frozen_check_result": frozen_check,
+                    "spam_check_result": spam_status,
                     "status": AccountStatus.PENDING,  # Always pending for admin review
                     "updated_at": utc_now()
                 }}
@@ -1261,36 +1675,40 @@ Send your phone number:
             
             # Calculate quality score
             checks = verification_result.get("checks", {})
-            quality_score = 0
-            
-            if checks.get("profile_completeness", {}).get("passed"):
-                quality_score += 30
-            if checks.get("account_age", {}).get("passed"):
-                quality_score += 20
-            if checks.get("spam_status", {}).get("passed"):
-                quality_score += 25
-            if checks.get("activity_patterns", {}).get("passed"):
-                quality_score += 15
-            if checks.get("two_factor_auth", {}).get("passed"):
-                quality_score += 10
+            quality_score = sum(
+                weight for check, weight in QUALITY_SCORE_WEIGHTS if checks.get(check, {}).get("passed")
+            )
             
             # Show results to seller
-            result_message = f"✅ **Automated Checks Complete!**\n\n"
-            result_message += f"🔓 **Frozen Status:** Not Frozen\n"
-            result_message += f"📊 **Quality Score:** {quality_score}/100\n"
-            result_message += f"🔍 **Verification Score:** {verification_result.get('score_percentage', 0):.1f}%\n"
-            result_message += f"🚫 **Spam Status:** {'Clean' if spam_status.get('status') == 'clean' else 'Limited'}\n\n"
-            result_message += f"⏳ **Status:** Pending admin review\n\n"
-            result_message += f"Your account has been sent to admin for manual verification. You'll be notified once approved!"
+            result_message = VERIFICATION_COMPLETE_MESSAGE.format(
+                quality_score=quality_score,
+                verification_score=verification_result.get('score_percentage', 0),
+                spam_status='Clean' if spam_status.get('status') == 'clean' else 'Limited'
+            )
             
-            await self.send_message(chat_id, result_message)
+            self.queue_message(chat_id, result_message)
             
             # Notify admin about new account for review
             await self.notify_admin_new_account(account_id, account_doc, quality_score, verification_result)
             
         except Exception as e:
-            logger.error(f"Verification error: {str(e)}")
+            logger.exception(f"Verification error: {str(e)}")
             await self.send_message(chat_id, "❌ **Verification Error**\n\nAn error occurred during verification.")
+        finally:
+            if checking_task:
+                checking_task.cancel()
+    
+    async def _mark_checking_after_delay(self, account_id, started_at):
+        """Set CHECKING once verification has run for CHECKING_STATUS_DELAY seconds.
+        
+        The updated_at filter turns this into a no-op if a result was already written,
+        even if the write is still in flight when the task is cancelled.
+        """
+        await asyncio.sleep(CHECKING_STATUS_DELAY)
+        await self.db_connection.accounts.update_one(
+            {"_id": account_id, "$or": [{"updated_at": {"$lte": started_at}}, {"updated_at": {"$exists": False}}]},
+            {"$set": {"status": AccountStatus.CHECKING, "updated_at": utc_now()}}
+        )
     
     async def handle_upload_account(self, event, user):
         """Handle upload account"""
@@ -1305,41 +1723,53 @@ This helps us match the right proxy.
 **Common Countries:**
             """
             
-            buttons = [
-                [Button.inline("🇮🇳 India", "country_IN"), Button.inline("🇺🇸 USA", "country_US")],
-                [Button.inline("🇬🇧 UK", "country_GB"), Button.inline("🇨🇦 Canada", "country_CA")],
-                [Button.inline("🇦🇺 Australia", "country_AU"), Button.inline("🇩🇪 Germany", "country_DE")],
-                [Button.inline("🌐 Other", "country_OTHER")],
-                [Button.inline("🔙 Back", "back_to_main")]
-            ]
-            
-            await self.edit_message(event, message, buttons)
+            await self.edit_message(event, message, COUNTRY_KEYBOARD)
             
         except Exception as e:
             logger.error(f"Upload account handler error: {str(e)}")
             await self.edit_message(event, "❌ An error occurred. Please try again.")
     
+    def invalidate_seller_stats(self, seller_id):
+        """Drop cached account counts after a seller's accounts change"""
+        cache_service.delete(f"seller_stats:{seller_id}")
+    
+    async def get_seller_account_counts(self, seller_id):
+        """Get total, approved and sold account counts for a seller in one aggregation"""
+        cache_key = f"seller_stats:{seller_id}"
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        pipeline = [{"$match": {"seller_id": seller_id}}, SELLER_COUNTS_GROUP]
+        result = await self.db_connection.accounts.aggregate(pipeline, hint=[("seller_id", 1), ("status", 1)]).to_list(1)
+        if result:
+            counts = (result[0]["total"], result[0]["approved"], result[0]["sold"])
+        else:
+            counts = (0, 0, 0)
+        
+        cache_service.set(cache_key, counts, ttl_seconds=30)
+        return counts
+    
     async def handle_seller_stats(self, event, user):
         """Handle seller stats"""
         try:
-            total_accounts = await self.db_connection.accounts.count_documents({"seller_id": user.telegram_user_id})
-            approved_accounts = await self.db_connection.accounts.count_documents({"seller_id": user.telegram_user_id, "status": "approved"})
-            sold_accounts = await self.db_connection.accounts.count_documents({"seller_id": user.telegram_user_id, "status": "sold"})
-            
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
+            uid = user.telegram_user_id
+            (total_accounts, approved_accounts, sold_accounts), user_doc = await asyncio.gather(
+                self.get_seller_account_counts(uid),
+                self.db_connection.users.find_one({"telegram_user_id": uid}, {"balance": 1})
+            )
             balance = user_doc.get("balance", 0.0) if user_doc else 0.0
             
-            stats_message = f"""📊 **Your Seller Statistics**
-
-📤 **Total Uploaded:** {total_accounts}
-✅ **Approved:** {approved_accounts}
-💰 **Sold:** {sold_accounts}
-💵 **Current Balance:** ${balance:.2f}
-
-📈 **Success Rate:** {(approved_accounts/total_accounts*100) if total_accounts > 0 else 0:.1f}%
-💎 **Conversion Rate:** {(sold_accounts/approved_accounts*100) if approved_accounts > 0 else 0:.1f}%"""
+            stats_message = SELLER_STATS_TEMPLATE.format_map({
+                "total": total_accounts,
+                "approved": approved_accounts,
+                "sold": sold_accounts,
+                "balance": balance,
+                "success_rate": (approved_accounts / total_accounts * 100) if total_accounts > 0 else 0,
+                "conversion_rate": (sold_accounts / approved_accounts * 100) if approved_accounts > 0 else 0
+            })
             
-            await self.edit_message(event, stats_message, [[Button.inline("🔙 Back", "back_to_main")]])
+            await self.edit_message(event, stats_message, BACK_KEYBOARD)
             
         except Exception as e:
             logger.error(f"Seller stats handler error: {str(e)}")
@@ -1348,9 +1778,7 @@ This helps us match the right proxy.
     async def handle_my_rating(self, event, user):
         """Handle my rating"""
         try:
-            total_accounts = await self.db_connection.accounts.count_documents({"seller_id": user.telegram_user_id})
-            approved_accounts = await self.db_connection.accounts.count_documents({"seller_id": user.telegram_user_id, "status": "approved"})
-            sold_accounts = await self.db_connection.accounts.count_documents({"seller_id": user.telegram_user_id, "status": "sold"})
+            total_accounts, approved_accounts, sold_accounts = await self.get_seller_account_counts(user.telegram_user_id)
             
             if total_accounts == 0:
                 rating = 0.0
@@ -1361,23 +1789,13 @@ This helps us match the right proxy.
                 rating = (success_rate * 0.7 + conversion_rate * 0.3) * 5
                 rating_text = f"{rating:.1f}/5.0 ⭐"
             
-            rating_message = f"""⭐ **Your Seller Rating**
-
-🌟 **Current Rating:** {rating_text}
-
-**Rating Factors:**
-• Account approval rate: {(approved_accounts/total_accounts*100) if total_accounts > 0 else 0:.1f}%
-• Sales conversion rate: {(sold_accounts/approved_accounts*100) if approved_accounts > 0 else 0:.1f}%
-• Account quality scores
-• Customer feedback
-
-**Tips to Improve:**
-• Upload high-quality accounts
-• Ensure accounts have clean history
-• Provide accurate information
-• Maintain good account standards"""
+            rating_message = SELLER_RATING_TEMPLATE.format_map({
+                "rating_text": rating_text,
+                "approval_rate": (approved_accounts / total_accounts * 100) if total_accounts > 0 else 0,
+                "conversion_rate": (sold_accounts / approved_accounts * 100) if approved_accounts > 0 else 0
+            })
             
-            await self.edit_message(event, rating_message, [[Button.inline("🔙 Back", "back_to_main")]])
+            await self.edit_message(event, rating_message, BACK_KEYBOARD)
             
         except Exception as e:
             logger.error(f"My rating handler error: {str(e)}")
@@ -1386,34 +1804,7 @@ This helps us match the right proxy.
     async def handle_help(self, event):
         """Handle help"""
         try:
-            help_message = """❓ **Help & Support**
-
-**How to Sell Accounts:**
-1. Click 'Upload Account' or 'Sell via OTP'
-2. Provide session file/string or phone number
-3. Complete verification process
-4. Wait for admin approval
-5. Get paid when account sells!
-
-**Upload Methods:**
-📤 **Session Upload**: Upload .session files or session strings
-📱 **Phone + OTP**: Verify ownership via phone number
-
-**Account Requirements:**
-✅ Must be your own account
-✅ Clean history (no spam/bans)
-✅ Active and accessible
-✅ No illegal activity
-
-**Payment:**
-💰 Earnings added to your balance
-💸 Request payout via UPI or Crypto
-⏰ Payouts processed within 24 hours
-
-**Need More Help?**
-Contact our support team for assistance."""
-            
-            await self.edit_message(event, help_message, [[Button.inline("🔙 Back", "back_to_main")]])
+            await self.edit_message(event, HELP_MESSAGE, BACK_KEYBOARD)
             
         except Exception as e:
             logger.error(f"Help handler error: {str(e)}")
@@ -1423,7 +1814,6 @@ Contact our support team for assistance."""
     async def show_proxy_prompt(self, chat_id, seller_id, account_id):
         """Show proxy prompt to seller"""
         try:
-            from app.models import SellerProxyManager
             proxy_manager = SellerProxyManager(self.db_connection)
             
             # Check if seller needs new proxy
@@ -1471,8 +1861,7 @@ Would you like to add a new proxy or use existing?
         except Exception as e:
             logger.error(f"Show proxy prompt error: {e}")
             # Continue with verification if error
-            import asyncio
-            asyncio.create_task(self.run_verification(account_id, chat_id))
+            self.start_verification(account_id, chat_id)
     
     async def handle_add_proxy(self, event, user, account_id):
         """Handle add proxy"""
@@ -1499,14 +1888,14 @@ Send your proxy configuration:
             await self.edit_message(event, message, [[Button.inline("❌ Cancel", f"skip_proxy_{account_id}")]])
             
             # Set state
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
+            await self.update_user(
+                user.telegram_user_id,
                 {"$set": {"state": f"awaiting_proxy_{account_id}"}}
             )
             
         except Exception as e:
             logger.error(f"Handle add proxy error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def handle_skip_proxy_confirm(self, event, user, account_id):
         """Show skip confirmation"""
@@ -1538,7 +1927,7 @@ Do you really want to skip?
             
         except Exception as e:
             logger.error(f"Skip proxy confirm error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def handle_skip_proxy_final(self, event, user, account_id):
         """Handle final skip"""
@@ -1546,23 +1935,20 @@ Do you really want to skip?
             await self.edit_message(event, "⚠️ **Proxy Skipped**\n\n🔍 Starting verification without proxy...\n\n⚠️ Remember: No payment if account gets frozen!")
             
             # Start verification
-            import asyncio
-            asyncio.create_task(self.run_verification(account_id, event.chat_id))
+            self.start_verification(account_id, event.chat_id)
             
         except Exception as e:
             logger.error(f"Skip proxy final error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
 
     
     async def process_proxy_config(self, event, seller_id, account_id, proxy_text):
         """Process proxy configuration"""
         try:
-            import re
-            from app.models import SellerProxy, SellerProxyManager
             
             # Clear state
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": seller_id},
+            await self.update_user(
+                seller_id,
                 {"$unset": {"state": ""}}
             )
             
@@ -1595,7 +1981,6 @@ Do you really want to skip?
             await proxy_manager.add_proxy(seller_id, proxy)
             
             # Link account to proxy
-            from bson import ObjectId
             await self.db_connection.accounts.update_one(
                 {"_id": ObjectId(account_id)},
                 {"$set": {"proxy_host": host, "uses_proxy": True}}
@@ -1611,8 +1996,7 @@ Do you really want to skip?
             )
             
             # Start verification
-            import asyncio
-            asyncio.create_task(self.run_verification(account_id, event.chat_id))
+            self.start_verification(account_id, event.chat_id)
             
         except Exception as e:
             logger.error(f"Process proxy config error: {e}")
@@ -1623,8 +2007,8 @@ Do you really want to skip?
         """Handle country selection for upload"""
         try:
             # Store country temporarily
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
+            await self.update_user(
+                user.telegram_user_id,
                 {"$set": {"temp_country": country}}
             )
             
@@ -1633,12 +2017,11 @@ Do you really want to skip?
             
         except Exception as e:
             logger.error(f"Country selected error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def show_proxy_prompt_before_upload(self, event, user, country):
         """Show proxy prompt before upload"""
         try:
-            from app.models import SellerProxyManager
             proxy_manager = SellerProxyManager(self.db_connection)
             
             country_names = {
@@ -1687,25 +2070,29 @@ Add {country_name} proxy now:
             
         except Exception as e:
             logger.error(f"Show proxy prompt before upload error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def handle_phone_for_proxy(self, event, user, phone_number):
         """Handle phone number and detect country for proxy"""
         try:
-            print(f"[SELLER] handle_phone_for_proxy called - phone={phone_number}, user={user.telegram_user_id}")
             logger.info(f"[SELLER] handle_phone_for_proxy called with phone={phone_number}, user={user.telegram_user_id}")
             
+            phone_number = normalize_phone(phone_number)
+            if not phone_number:
+                # Keep waiting for a phone number
+                self.pending_actions.set(user.telegram_user_id, {"action": "awaiting_phone_for_proxy"}, PENDING_ACTION_TTL)
+                await self.send_message(event.chat_id, INVALID_PHONE_MESSAGE)
+                return
+            
             # Detect country from phone
             country = self.detect_country_from_phone(phone_number)
-            print(f"[SELLER] Detected country: {country}")
             
             # Store phone and country FIRST
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
+            await self.update_user(
+                user.telegram_user_id,
                 {"$set": {"temp_phone": phone_number, "temp_country": country}}
             )
             
-            print(f"[SELLER] Saved to DB: temp_phone={phone_number}, temp_country={country}")
             logger.info(f"[SELLER] Saved temp_phone={phone_number}, temp_country={country} for user {user.telegram_user_id}")
             
             country_names = {
@@ -1747,10 +2134,6 @@ Add {country_name} proxy now:
             
             await self.send_message(event.chat_id, message, buttons)
             
-            # Debug: Check if temp_phone is still in DB after sending message
-            user_check = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
-            print(f"[SELLER] After send_message, temp_phone in DB: {user_check.get('temp_phone') if user_check else 'NO USER'}")
-            
         except Exception as e:
             logger.error(f"Handle phone for proxy error: {e}")
             await self.send_message(event.chat_id, f"❌ Error: {str(e)}")
@@ -1799,25 +2182,23 @@ Supported: SOCKS5, SOCKS4, HTTP
 Send your {country_name} proxy:
             """
             
-            await self.edit_message(event, message, [[Button.inline("❌ Cancel", "back_to_main")]])
+            await self.edit_message(event, message, CANCEL_TO_MAIN_KEYBOARD)
             
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
+            await self.update_user(
+                user.telegram_user_id,
                 {"$set": {"state": f"awaiting_proxy_upload_{country}"}}
             )
             
         except Exception as e:
             logger.error(f"Add proxy upload error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def handle_add_proxy_otp(self, event, user, country):
         """Handle add proxy for OTP flow"""
         try:
-            print(f"[SELLER] handle_add_proxy_otp called for country={country}, user={user.telegram_user_id}")
             
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
+            user_doc = await self.get_user_doc(user.telegram_user_id)
             temp_phone = user_doc.get("temp_phone") if user_doc else None
-            print(f"[SELLER] temp_phone in DB: {temp_phone}")
             logger.info(f"[SELLER] handle_add_proxy_otp - temp_phone before: {temp_phone}")
             
             country_names = {"IN": "Indian", "US": "US", "GB": "UK", "CA": "Canadian", "AU": "Australian", "DE": "German", "OTHER": ""}
@@ -1838,15 +2219,15 @@ Supported: SOCKS5, SOCKS4, HTTP
 Send your {country_name} proxy:
             """
             
-            await self.edit_message(event, message, [[Button.inline("❌ Cancel", "back_to_main")]])
+            await self.edit_message(event, message, CANCEL_TO_MAIN_KEYBOARD)
             
             update_data = {"state": f"awaiting_proxy_otp_{country}"}
             if temp_phone:
                 update_data["temp_phone"] = temp_phone
                 logger.info(f"[SELLER] Preserving temp_phone: {temp_phone}")
             
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
+            await self.update_user(
+                user.telegram_user_id,
                 {"$set": update_data}
             )
             
@@ -1854,7 +2235,7 @@ Send your {country_name} proxy:
             
         except Exception as e:
             logger.error(f"Add proxy OTP error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def handle_skip_proxy_upload(self, event, user, country):
         """Handle skip proxy for upload"""
@@ -1879,16 +2260,11 @@ Do you really want to skip?
             
         except Exception as e:
             logger.error(f"Skip proxy upload error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def handle_skip_proxy_otp(self, event, user, country):
         """Handle skip proxy for OTP"""
         try:
-            print(f"[SELLER] handle_skip_proxy_otp called for country={country}")
-            
-            # Check temp_phone before doing anything
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
-            print(f"[SELLER] temp_phone before skip: {user_doc.get('temp_phone') if user_doc else 'NO USER'}")
             message = """
 ⚠️ **WARNING: Skip Proxy?**
 
@@ -1909,7 +2285,7 @@ Do you really want to skip?
             
         except Exception as e:
             logger.error(f"Skip proxy OTP error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
 
     
     async def handle_skip_confirm_upload(self, event, user, country):
@@ -1917,19 +2293,19 @@ Do you really want to skip?
         try:
             await self.edit_message(event, "⚠️ **Proxy Skipped**\n\n📤 Now send your session file/string:")
             
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
+            await self.update_user(
+                user.telegram_user_id,
                 {"$set": {"state": "awaiting_upload", "skip_proxy": True}}
             )
             
         except Exception as e:
             logger.error(f"Skip confirm upload error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
     
     async def handle_skip_confirm_otp(self, event, user, country):
         """Handle skip confirmation for OTP"""
         try:
-            user_doc = await self.db_connection.users.find_one({"telegram_user_id": user.telegram_user_id})
+            user_doc = await self.get_user_doc(user.telegram_user_id)
             phone = user_doc.get("temp_phone") if user_doc else None
             
             if not phone:
@@ -1939,34 +2315,27 @@ Do you really want to skip?
             await self.edit_message(event, "⚠️ **Proxy Skipped**\n\n📱 Sending OTP...")
             
             # Mark as skipped and continue with OTP
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": user.telegram_user_id},
+            await self.update_user(
+                user.telegram_user_id,
                 {"$set": {"skip_proxy": True}, "$unset": {"temp_proxy_host": ""}}
             )
             
             # Create minimal user object
-            class UserObj:
-                def __init__(self, uid):
-                    self.telegram_user_id = uid
-            user_obj = UserObj(user.telegram_user_id)
+            user_obj = UserRef(user.telegram_user_id)
             
             await self.process_phone_number(event, user_obj, phone)
             
         except Exception as e:
             logger.error(f"Skip confirm OTP error: {e}")
-            await self.answer_callback(event, "❌ Error", alert=True)
+            self.queue_message(event.chat_id, "❌ An error occurred. Please try again.")
 
     
     async def process_proxy_before_account(self, event, seller_id, flow_type, country, proxy_text):
         """Process proxy configuration before account upload"""
         try:
-            import re
-            import html
-            from urllib.parse import urlparse, parse_qs
-            from app.models import SellerProxy, SellerProxyManager
             
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": seller_id},
+            await self.update_user(
+                seller_id,
                 {"$unset": {"state": ""}}
             )
             
@@ -2025,9 +2394,14 @@ Do you really want to skip?
             proxy_manager = SellerProxyManager(self.db_connection)
             await proxy_manager.add_proxy(seller_id, proxy)
             
-            await self.db_connection.users.update_one(
-                {"telegram_user_id": seller_id},
-                {"$set": {"temp_proxy_host": host_val, "has_proxy": True}}
+            proxy_fields = {"temp_proxy_host": host_val, "has_proxy": True}
+            if flow_type == "upload":
+                # Arm the upload state in the same write
+                proxy_fields["state"] = "awaiting_upload"
+            user_doc = await self.find_and_update_user(
+                seller_id,
+                {"$set": proxy_fields},
+                projection={"temp_phone": 1}
             )
             
             await self.send_message(
@@ -2043,12 +2417,7 @@ Do you really want to skip?
                     event.chat_id,
                     "📤 **Now Upload Your Account**\n\nSend:\n• Session file\n• Session string\n• TData archive"
                 )
-                await self.db_connection.users.update_one(
-                    {"telegram_user_id": seller_id},
-                    {"$set": {"state": "awaiting_upload"}}
-                )
             elif flow_type == "otp":
-                user_doc = await self.db_connection.users.find_one({"telegram_user_id": seller_id})
                 phone = user_doc.get("temp_phone") if user_doc else None
                 
                 logger.info(f"[SELLER] OTP flow continuation - phone: {phone}")
@@ -2058,10 +2427,7 @@ Do you really want to skip?
                         event.chat_id,
                         f"📱 **Sending OTP to {phone}...**\n\nPlease wait..."
                     )
-                    class UserObj:
-                        def __init__(self, uid):
-                            self.telegram_user_id = uid
-                    user_obj = UserObj(seller_id)
+                    user_obj = UserRef(seller_id)
                     await self.process_phone_number(event, user_obj, phone)
                 else:
                     logger.error(f"[SELLER] Phone not found for seller {seller_id}")
@@ -2075,7 +2441,6 @@ Do you really want to skip?
     async def notify_admin_new_account(self, account_id, account_doc, quality_score, verification_result):
         """Notify admin about new account pending review"""
         try:
-            import os
             admin_ids_str = os.getenv('ADMIN_USER_IDS', '')
             if not admin_ids_str:
                 logger.warning("No admin user IDs configured")
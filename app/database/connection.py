@@ -1,7 +1,61 @@
+import logging
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.errors import OperationFailure
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+# Pool sizing for the single client shared by all bots and services (overridable per deployment)
+MONGO_POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv('MONGO_MAX_POOL_SIZE', '50')),
+    "minPoolSize": int(os.getenv('MONGO_MIN_POOL_SIZE', '10')),
+    "maxIdleTimeMS": int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000')),
+    "waitQueueTimeoutMS": int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000')),
+}
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts pool connections so get_stats() can report live usage"""
+    
+    def __init__(self):
+        self.open_connections = 0
+        self.checked_out = 0
+        self.checkout_failures = 0
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        self.open_connections += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        self.open_connections -= 1
+    
+    def connection_check_out_started(self, event):
+        pass
+    
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+    
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+    
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database = None
@@ -43,10 +97,15 @@ class DatabaseConnection:
     def __init__(self):
         self.client = None
         self.db = None
+        self.pool_stats = PoolStatsListener()
     
     async def connect(self):
         mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/telegram_marketplace')
-        self.client = AsyncIOMotorClient(mongo_uri)
+        # zlib wire compression shrinks the large verification check/log snapshots;
+        # servers that don't support it fall back to uncompressed messages
+        self.client = AsyncIOMotorClient(
+            mongo_uri, compressors="zlib", event_listeners=[self.pool_stats], **MONGO_POOL_OPTIONS
+        )
         # Use explicit database name as fallback
         try:
             self.db = self.client.get_default_database()
@@ -84,16 +143,53 @@ class DatabaseConnection:
         await self._create_indexes()
     
     async def _create_indexes(self):
-        # User indexes
-        await self.users.create_index("telegram_user_id", unique=True)
-        
-        # Account indexes
-        await self.accounts.create_index("user_id")
-        await self.accounts.create_index("verification_status")
-        await self.accounts.create_index("country")
+        indexes = [
+            # User indexes
+            (self.users, "telegram_user_id", {"unique": True}),
+            
+            # Account indexes
+            (self.accounts, "user_id", {}),
+            (self.accounts, [("seller_id", 1), ("status", 1)], {}),
+            (self.accounts, [("seller_id", 1), ("created_at", -1)], {}),
+            (self.accounts, "verification_status", {}),
+            (self.accounts, "country", {}),
+            
+            # Pricing indexes
+            (self.country_pricing, "country", {"unique": True}),
+            
+            # Transaction indexes
+            (self.transactions, [("user_id", 1), ("created_at", -1)], {}),
+        ]
+        for collection, keys, options in indexes:
+            try:
+                await collection.create_index(keys, **options)
+            except OperationFailure as e:
+                # An existing index with other options must not block startup
+                logger.warning(f"Could not create index {keys} on {collection.name}: {e}")
+    
+    def get_stats(self) -> dict:
+        """Connection pool and topology snapshot for monitoring"""
+        if not self.client:
+            return {"connected": False}
         
-        # Pricing indexes
-        await self.country_pricing.create_index("country", unique=True)
+        servers = self.client.topology_description.server_descriptions()
+        return {
+            "connected": True,
+            "pool": {
+                "max_size": MONGO_POOL_OPTIONS["maxPoolSize"],
+                "min_size": MONGO_POOL_OPTIONS["minPoolSize"],
+                "open_connections": self.pool_stats.open_connections,
+                "checked_out": self.pool_stats.checked_out,
+                "checkout_failures": self.pool_stats.checkout_failures,
+            },
+            "servers": {
+                f"{host}:{port}": {
+                    "type": description.server_type_name,
+                    "round_trip_time_ms": round(description.round_trip_time * 1000, 2) if description.round_trip_time is not None else None,
+                }
+                for (host, port), description in servers.items()
+            },
+        }
     
     async def close(self):
         if self.client:
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
@@ -76,20 +77,38 @@ class BotSettings:
 class SettingsManager:
     """Manages bot settings from database"""
     
+    # Shared by every bot's manager so an admin write invalidates all readers
+    CACHE_TTL_SECONDS = 60
+    _cache: Dict[str, tuple] = {}
+    
     def __init__(self, db_connection):
         self.db = db_connection
     
+    @classmethod
+    def invalidate_cache(cls, setting_type: str = None):
+        """Drop one cached settings type (or all of them) after a write"""
+        if setting_type:
+            cls._cache.pop(setting_type, None)
+        else:
+            cls._cache.clear()
+    
     async def get_setting(self, setting_type: str, key: str = None) -> Any:
-        """Get a specific setting value"""
+        """Get a specific setting value (cached in-process for CACHE_TTL_SECONDS)"""
         try:
-            settings_doc = await self.db.admin_settings.find_one({"type": setting_type})
-            
-            if not settings_doc:
-                # Return default values
-                defaults = getattr(BotSettings, setting_type.upper(), {})
-                return defaults.get(key) if key else defaults
+            cached = self._cache.get(setting_type)
+            if cached and time.monotonic() - cached[0] < self.CACHE_TTL_SECONDS:
+                settings = cached[1]
+            else:
+                settings_doc = await self.db.admin_settings.find_one({"type": setting_type})
+                
+                if not settings_doc:
+                    # Return default values
+                    settings = getattr(BotSettings, setting_type.upper(), {})
+                else:
+                    settings = settings_doc.get("settings", {})
+                
+                self._cache[setting_type] = (time.monotonic(), settings)
             
-            settings = settings_doc.get("settings", {})
             return settings.get(key) if key else settings
             
         except Exception as e:
@@ -100,8 +119,8 @@ class SettingsManager:
     async def update_setting(self, setting_type: str, key: str, value: Any, admin_id: int) -> bool:
         """Update a specific setting"""
         try:
-            # Get current settings
-            current_settings = await self.get_setting(setting_type)
+            # Get current settings (copied so the cached dict isn't mutated)
+            current_settings = dict(await self.get_setting(setting_type))
             current_settings[key] = value
             
             # Update in database
@@ -116,6 +135,7 @@ class SettingsManager:
                 },
                 upsert=True
             )
+            self.invalidate_cache(setting_type)
             
             return True
             
@@ -164,6 +184,7 @@ class SettingsManager:
                 },
                 upsert=True
             )
+            self.invalidate_cache(setting_type)
             
             return True
             
@@ -79,9 +79,9 @@ class AccountLoginService:
                 }
                 
                 # Check if account already exists
-                existing = await self.db_connection.accounts.find_one({
-                    "telegram_account_id": me.id
-                })
+                existing = await self.db_connection.accounts.find_one(
+                    {"telegram_account_id": me.id}, {"_id": 1}
+                )
                 
                 if existing:
                     return {"success": False, "error": "Account already exists in marketplace"}
@@ -202,7 +202,7 @@ class AccountLoginService:
                 "success": True,
                 "session_string": session_string,
                 "account_info": account.get("account_info", {}),
-                "tfa_password": account.get("tfa_password")
+                "tfa_password": decrypt_data(account["tfa_password"]) if account.get("tfa_password") else None
             }
             
         except Exception as e:
@@ -7,14 +7,28 @@ import logging
 logger = logging.getLogger(__name__)
 
 class CacheService:
-    """In-memory cache with TTL support"""
+    """In-memory cache with TTL support, bounded to max_entries (least recently used evicted first)"""
     
-    def __init__(self):
+    # Inserts between full sweeps of expired entries; get() drops expired entries as it meets them
+    SWEEP_INTERVAL = 1000
+    
+    def __init__(self, max_entries: int = 10000):
         self.cache = {}
         self.ttl = {}
+        self.max_entries = max_entries
+        self.sets_since_sweep = 0
     
     def set(self, key: str, value: Any, ttl_seconds: int = 300):
         """Set cache value with TTL"""
+        self.sets_since_sweep += 1
+        if self.sets_since_sweep >= self.SWEEP_INTERVAL:
+            self.sets_since_sweep = 0
+            self.cleanup_expired()
+        
+        if key in self.cache:
+            del self.cache[key]  # Re-insert at the most recently used end
+        elif len(self.cache) >= self.max_entries:
+            self.delete(next(iter(self.cache)))
         self.cache[key] = value
         self.ttl[key] = datetime.utcnow() + timedelta(seconds=ttl_seconds)
         logger.debug(f"Cache set: {key} (TTL: {ttl_seconds}s)")
@@ -30,7 +44,9 @@ class CacheService:
             return None
         
         logger.debug(f"Cache hit: {key}")
-        return self.cache[key]
+        value = self.cache.pop(key)
+        self.cache[key] = value  # Mark as most recently used
+        return value
     
     def delete(self, key: str):
         """Delete cache entry"""
@@ -1,6 +1,7 @@
 from datetime import datetime
 import logging
 from typing import Dict, Any, Optional
+from app.models import SettingsManager
 from app.utils.datetime_utils import utc_now
 
 logger = logging.getLogger(__name__)
@@ -162,6 +163,7 @@ class PaymentSettingsService:
                 },
                 upsert=True
             )
+            SettingsManager.invalidate_cache("payment_settings")
             logger.info(f"Payment settings updated by admin {updated_by}")
             return True
         except Exception as e:
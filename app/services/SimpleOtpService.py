@@ -132,9 +132,7 @@ class SimpleOtpService:
                 'error': 'Failed to connect to Telegram. Please check your internet connection and try again'
             }
         except Exception as e:
-            logger.error(f"[OTP_SERVICE] Failed to send OTP to {phone_number}: {str(e)}")
-            import traceback
-            logger.error(f"[OTP_SERVICE] Traceback: {traceback.format_exc()}")
+            logger.exception(f"[OTP_SERVICE] Failed to send OTP to {phone_number}: {str(e)}")
             if client:
                 try:
                     await client.disconnect()
@@ -12,6 +12,12 @@ logger = logging.getLogger(__name__)
 class VerificationService:
     """Comprehensive account verification service"""
     
+    # Process-wide limit on concurrent verify_account runs. Shared by every instance
+    # so seller, admin and bulk verifications together never hold more than this many
+    # Telegram client sessions open at once; the seller bot sizes its worker pool from it.
+    MAX_CONCURRENT_VERIFICATIONS = 4
+    verification_slots = asyncio.Semaphore(MAX_CONCURRENT_VERIFICATIONS)
+    
     def __init__(self, db_connection):
         self.db_connection = db_connection
         self.settings_manager = SettingsManager(db_connection)
@@ -26,6 +32,10 @@ class VerificationService:
             account_data: Account data dictionary
             proxy: Optional proxy dict with keys: proxy_type, addr, port, username, password
         """
+        async with self.verification_slots:
+            return await self._verify_account(account_data, proxy)
+    
+    async def _verify_account(self, account_data: dict, proxy: dict = None) -> dict:
         try:
             session_string = account_data.get("session_string")
             if not session_string:
@@ -1,6 +1,7 @@
 """Universal Session Converter - Enhanced with opentele, TGConvertor, and TGSessionsConverter methods"""
 import os
 import json
+import asyncio
 import sqlite3
 import struct
 import base64
@@ -27,10 +28,14 @@ class UniversalSessionConverter:
     
     @classmethod
     async def convert_session(cls, source: Union[str, bytes], source_type: str = "auto") -> Dict[str, Any]:
-        """Universal session converter with auto-detection"""
+        """Universal session converter with auto-detection
+        
+        File parsing (SQLite, TData) runs in a worker thread so a large upload doesn't
+        stall other chats; only the Telegram login itself stays on the event loop.
+        """
         try:
             if source_type == "auto":
-                source_type = cls._detect_session_type(source)
+                source_type = await asyncio.to_thread(cls._detect_session_type, source)
             
             if source_type == "telethon_string":
                 return await cls._convert_telethon_string(source)
@@ -39,7 +44,7 @@ class UniversalSessionConverter:
             elif source_type == "telethon_session":
                 return await cls._convert_telethon_session(source)
             elif source_type == "tdata":
-                return cls._convert_tdata(source)
+                return await asyncio.to_thread(cls._convert_tdata, source)
             elif source_type == "json_session":
                 return await cls._convert_json_session(source)
             elif source_type == "session_bytes":
@@ -151,6 +156,14 @@ class UniversalSessionConverter:
     @classmethod
     async def _convert_pyrogram_session(cls, session_file: str) -> Dict[str, Any]:
         """Enhanced Pyrogram session conversion"""
+        result = await asyncio.to_thread(cls._read_pyrogram_session, session_file)
+        if not result.get("success"):
+            return result
+        return await cls._convert_telethon_string(result["session_string"])
+    
+    @classmethod
+    def _read_pyrogram_session(cls, session_file: str) -> Dict[str, Any]:
+        """Read a Pyrogram .session file into a Telethon string session (blocking)"""
         conn = None
         try:
             conn = sqlite3.connect(session_file)
@@ -177,9 +190,7 @@ class UniversalSessionConverter:
             session.set_dc(dc_id, server_address, port)
             session.auth_key = AuthKey(auth_key)
             
-            session_string = StringSession.save(session)
-            
-            return await cls._convert_telethon_string(session_string)
+            return {"success": True, "session_string": StringSession.save(session)}
             
         except (ValueError, OSError) as e:
             return {"success": False, "error": f"Pyrogram conversion failed: {str(e)}"}
@@ -195,6 +206,14 @@ class UniversalSessionConverter:
     @classmethod
     async def _convert_telethon_session(cls, session_file: str) -> Dict[str, Any]:
         """Convert Telethon .session file"""
+        result = await asyncio.to_thread(cls._read_telethon_session, session_file)
+        if not result.get("success"):
+            return result
+        return await cls._convert_telethon_string(result["session_string"])
+    
+    @classmethod
+    def _read_telethon_session(cls, session_file: str) -> Dict[str, Any]:
+        """Read a Telethon .session file into a string session (blocking)"""
         conn = None
         try:
             conn = sqlite3.connect(session_file)
@@ -212,9 +231,7 @@ class UniversalSessionConverter:
             session.set_dc(dc_id, str(server_address), port)
             session.auth_key = AuthKey(auth_key)
             
-            session_string = StringSession.save(session)
-            
-            return await cls._convert_telethon_string(session_string)
+            return {"success": True, "session_string": StringSession.save(session)}
             
         except (ValueError, OSError) as e:
             return {"success": False, "error": f"Telethon session conversion failed: {str(e)}"}
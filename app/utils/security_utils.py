@@ -2,8 +2,17 @@
 from pathlib import Path
 from typing import Optional
 import os
+import re
 from html import escape
 
+E164_PHONE = re.compile(r'\+[1-9]\d{7,14}')
+PHONE_SEPARATORS = re.compile(r'[\s\-().]')
+
+def normalize_phone(phone: str) -> Optional[str]:
+    """Return the E.164 form (+<digits>) of a phone number, or None if it is not one"""
+    phone = PHONE_SEPARATORS.sub('', phone or '')
+    return phone if E164_PHONE.fullmatch(phone) else None
+
 def validate_path(user_path: str, base_dir: str) -> str:
     """Validate and sanitize path to prevent traversal attacks"""
     try:
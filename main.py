@@ -2,6 +2,7 @@ import asyncio
 import logging
 import os
 import secrets
+import bson
 from dotenv import load_dotenv
 from telethon import TelegramClient, events, Button
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -28,6 +29,11 @@ from app.utils.logger import setup_logger
 from app.utils.error_tracker import ErrorTracker
 from app.utils.encryption_rotation import EncryptionKeyManager
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; fall back to the default loop
+    uvloop = None
+
 load_dotenv()
 
 logger = setup_logger(__name__)
@@ -51,6 +57,9 @@ def verify_webhook_signature(request_body: bytes, signature: str) -> bool:
 async def main():
     """Main application entry point"""
     try:
+        if not bson.has_c():
+            logger.warning("PyMongo BSON C extension not loaded - encoding/decoding will be slow")
+        
         db_connection = DatabaseConnection()
         await db_connection.connect()
         
@@ -191,4 +200,6 @@ async def main():
             await db_connection.close()
 
 if __name__ == "__main__":
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
@@ -35,6 +35,8 @@ async def create_indexes():
     await db.accounts.create_index("seller_id")
     await db.accounts.create_index("status")
     await db.accounts.create_index([("status", 1), ("created_at", -1)])
+    await db.accounts.create_index([("seller_id", 1), ("status", 1)])
+    await db.accounts.create_index([("seller_id", 1), ("created_at", -1)])
     await db.accounts.create_index("telegram_account_id", unique=True, sparse=True)
     logger.info("✓ Accounts indexes created")
     
@@ -52,6 +54,7 @@ async def create_indexes():
     await db.transactions.create_index("status")
     await db.transactions.create_index("type")
     await db.transactions.create_index([("user_id", 1), ("status", 1)])
+    await db.transactions.create_index([("user_id", 1), ("created_at", -1)])
     await db.transactions.create_index([("status", 1), ("created_at", -1)])
     logger.info("✓ Transactions indexes created")
     
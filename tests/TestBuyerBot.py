@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.bots.BuyerBot import BuyerBot
+
+class TestBuyerCallbackRouting:
+    
+    def setup_method(self):
+        """Setup test method"""
+        self.bot = BuyerBot.__new__(BuyerBot)
+        self.user = MagicMock()
+        self.bot.get_or_create_user = AsyncMock(return_value=self.user)
+        self.bot.answer_callback = AsyncMock()
+        self.bot.handle_deposit_sent = AsyncMock()
+        self.bot.handle_deposit_method = AsyncMock()
+        self.bot._build_callback_tables()
+    
+    def make_event(self, data):
+        event = MagicMock()
+        event.data = data.encode('utf-8')
+        return event
+    
+    @pytest.mark.asyncio
+    async def test_deposit_sent_reaches_deposit_sent_handler(self):
+        """Test that deposit_sent_<id> is not swallowed by the shorter deposit_ prefix"""
+        event = self.make_event("deposit_sent_65f0c0ffee")
+        
+        await self.bot.handle_callback(event)
+        
+        self.bot.handle_deposit_sent.assert_awaited_once_with(event, self.user, "65f0c0ffee")
+        self.bot.handle_deposit_method.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_deposit_method_still_routes(self):
+        """Test that deposit_<method> still reaches the deposit method handler"""
+        event = self.make_event("deposit_upi")
+        
+        await self.bot.handle_callback(event)
+        
+        self.bot.handle_deposit_method.assert_awaited_once_with(event, self.user, "upi")
+        self.bot.handle_deposit_sent.assert_not_awaited()
@@ -0,0 +1,68 @@
+import pytest
+from app.services.CacheService import CacheService
+
+class TestCacheService:
+    
+    def test_evicts_least_recently_used(self):
+        """Test that a full cache evicts the entry used longest ago"""
+        cache = CacheService(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        
+        assert cache.get("a") == 1  # "b" is now the least recently used
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_overwrite_refreshes_recency(self):
+        """Test that setting an existing key neither evicts nor leaves it stale"""
+        cache = CacheService(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 10
+        assert cache.get("b") is None
+        assert len(cache.cache) == 2
+    
+    def test_eviction_at_capacity_does_not_sweep(self):
+        """Test that inserting into a full cache evicts the LRU head without scanning for expired entries"""
+        cache = CacheService(max_entries=10)
+        for i in range(10):
+            cache.set(f"old{i}", i)
+        
+        sweeps = []
+        cache.cleanup_expired = lambda: sweeps.append(1)
+        for i in range(10):
+            cache.set(f"new{i}", i)
+        
+        assert sweeps == []
+        assert list(cache.cache) == [f"new{i}" for i in range(10)]
+        assert len(cache.ttl) == 10
+    
+    def test_expired_entries_are_swept_periodically(self):
+        """Test that expired entries are removed once every SWEEP_INTERVAL inserts"""
+        cache = CacheService(max_entries=100)
+        cache.SWEEP_INTERVAL = 5
+        cache.set("expired", 1, ttl_seconds=-1)
+        for i in range(3):
+            cache.set(f"live{i}", i)
+        assert "expired" in cache.cache
+        
+        cache.set("live3", 3)
+        
+        assert "expired" not in cache.cache
+        assert "expired" not in cache.ttl
+        assert len(cache.cache) == 4
+    
+    def test_get_drops_expired_entry(self):
+        """Test that reading an expired entry returns None and removes it"""
+        cache = CacheService(max_entries=2)
+        cache.set("a", 1, ttl_seconds=-1)
+        
+        assert cache.get("a") is None
+        assert "a" not in cache.cache
+        assert "a" not in cache.ttl
@@ -0,0 +1,30 @@
+import pytest
+from app.utils.security_utils import normalize_phone
+
+class TestNormalizePhone:
+    
+    @pytest.mark.parametrize("raw, expected", [
+        # Separators are stripped
+        ("+1 234 567 8901", "+12345678901"),
+        ("+1-234-567-8901", "+12345678901"),
+        ("+1 (234) 567.8901", "+12345678901"),
+        ("+91\t98765 43210", "+919876543210"),
+        # Missing '+'
+        ("12345678901", None),
+        ("001234567890", None),
+        # Country code cannot start with 0
+        ("+0123456789", None),
+        # Length bounds: country digit plus 7 to 14 more digits (8-15 in total)
+        ("+1234567", None),
+        ("+12345678", "+12345678"),
+        ("+123456789012345", "+123456789012345"),
+        ("+1234567890123456", None),
+        # Non-digits and empty input
+        ("+aaaaaaaaaa", None),
+        ("+1234567890x", None),
+        ("", None),
+        (None, None),
+    ])
+    def test_normalize_phone(self, raw, expected):
+        """Test E.164 normalization of seller phone numbers"""
+        assert normalize_phone(raw) == expected
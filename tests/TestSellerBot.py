@@ -0,0 +1,213 @@
+import io
+import operator
+import os
+import tempfile
+import zipfile
+import pytest
+from datetime import datetime
+from app.bots.SellerBot import SellerBot
+
+NOW = datetime(2026, 10, 17, 12, 0)
+YESTERDAY = datetime(2026, 10, 16, 23, 30)
+
+OPERATORS = {
+    "$ifNull": lambda value, default: default if value is None else value,
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$lt": operator.lt,
+    "$gt": operator.gt,
+    "$add": operator.add,
+    "$subtract": operator.sub,
+    "$or": lambda *values: any(values),
+    "$and": lambda *values: all(values),
+}
+
+def evaluate(expr, doc):
+    """Evaluate the aggregation expressions the upload quota uses against a plain dict"""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if isinstance(expr, dict) and len(expr) == 1 and next(iter(expr)).startswith("$"):
+        op, args = next(iter(expr.items()))
+        if op == "$literal":
+            return args
+        if op == "$dateToString":
+            date = evaluate(args["date"], doc)
+            return date.strftime(args["format"]) if date else None
+        if op == "$cond":
+            condition, then, otherwise = args
+            return evaluate(then, doc) if evaluate(condition, doc) else evaluate(otherwise, doc)
+        return OPERATORS[op](*[evaluate(arg, doc) for arg in args])
+    return expr
+
+class FakeUsers:
+    """Single-document users collection that applies filters and update pipelines"""
+    
+    def __init__(self, doc):
+        self.doc = dict(doc)
+        self.calls = []
+    
+    def _apply(self, query, pipeline):
+        self.calls.append((query, pipeline))
+        if self.doc.get("telegram_user_id") != query["telegram_user_id"]:
+            return None
+        if "$expr" in query and not evaluate(query["$expr"], self.doc):
+            return None
+        
+        pre_image = dict(self.doc)
+        for stage in pipeline:
+            (op, fields), = stage.items()
+            assert op == "$set"
+            before = dict(self.doc)
+            self.doc.update({field: evaluate(value, before) for field, value in fields.items()})
+        return pre_image
+    
+    async def find_one_and_update(self, query, pipeline, projection=None):
+        return self._apply(query, pipeline)
+    
+    async def update_one(self, query, pipeline):
+        self._apply(query, pipeline)
+
+class TestUploadQuota:
+    
+    def make_bot(self, doc):
+        bot = SellerBot.__new__(SellerBot)
+        bot.db_connection = type("FakeDb", (), {})()
+        bot.db_connection.users = FakeUsers({"telegram_user_id": 1, **doc})
+        return bot
+    
+    @pytest.mark.asyncio
+    async def test_same_day_counts_up_to_limit(self):
+        """Test that uploads on the same day increment the count until max_uploads"""
+        bot = self.make_bot({"last_upload_day": "2026-10-17", "upload_count_today": 1})
+        
+        assert await bot.reserve_upload_slot(1, NOW, max_uploads=2) is True
+        assert bot.db_connection.users.doc["upload_count_today"] == 2
+        
+        assert await bot.reserve_upload_slot(1, NOW, max_uploads=2) is False
+        assert bot.db_connection.users.doc["upload_count_today"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_limit_filter_shape(self):
+        """Test that the limit lives in the filter so a denied reservation writes nothing"""
+        bot = self.make_bot({})
+        await bot.reserve_upload_slot(1, NOW, max_uploads=3)
+        
+        query, pipeline = bot.db_connection.users.calls[0]
+        assert query["telegram_user_id"] == 1
+        assert "$or" in query["$expr"]
+        assert len(pipeline) == 1
+        assert set(pipeline[0]["$set"]) == {"upload_count_today", "last_upload_date", "last_upload_day"}
+    
+    @pytest.mark.asyncio
+    async def test_new_day_resets_count(self):
+        """Test that the first upload of a new day starts the count at 1, even at yesterday's limit"""
+        bot = self.make_bot({"last_upload_day": "2026-10-16", "upload_count_today": 5})
+        
+        assert await bot.reserve_upload_slot(1, NOW, max_uploads=5) is True
+        doc = bot.db_connection.users.doc
+        assert doc["upload_count_today"] == 1
+        assert doc["last_upload_day"] == "2026-10-17"
+        assert doc["last_upload_date"] == NOW
+    
+    @pytest.mark.asyncio
+    async def test_legacy_document_same_day(self):
+        """Test that documents with only last_upload_date count today's uploads"""
+        bot = self.make_bot({"last_upload_date": datetime(2026, 10, 17, 8, 0), "upload_count_today": 2})
+        
+        assert await bot.reserve_upload_slot(1, NOW, max_uploads=2) is False
+        assert await bot.reserve_upload_slot(1, NOW, max_uploads=3) is True
+        assert bot.db_connection.users.doc["upload_count_today"] == 3
+        assert bot.db_connection.users.doc["last_upload_day"] == "2026-10-17"
+    
+    @pytest.mark.asyncio
+    async def test_legacy_document_previous_day(self):
+        """Test that a legacy last_upload_date from an earlier day resets the count"""
+        bot = self.make_bot({"last_upload_date": YESTERDAY, "upload_count_today": 9})
+        
+        assert await bot.reserve_upload_slot(1, NOW, max_uploads=2) is True
+        assert bot.db_connection.users.doc["upload_count_today"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_no_limit(self):
+        """Test that max_uploads=None always grants the slot and still counts it"""
+        bot = self.make_bot({"last_upload_day": "2026-10-17", "upload_count_today": 999})
+        
+        assert await bot.reserve_upload_slot(1, NOW) is True
+        query, _ = bot.db_connection.users.calls[0]
+        assert "$expr" not in query
+        assert bot.db_connection.users.doc["upload_count_today"] == 1000
+    
+    @pytest.mark.asyncio
+    async def test_release_gives_back_slot_and_sets_fields(self):
+        """Test that releasing a slot decrements today's count and restores state in one write"""
+        bot = self.make_bot({"last_upload_day": "2026-10-17", "upload_count_today": 2})
+        
+        await bot.release_upload_slot(1, NOW, {"state": "awaiting_otp_code"})
+        doc = bot.db_connection.users.doc
+        assert doc["upload_count_today"] == 1
+        assert doc["state"] == "awaiting_otp_code"
+        assert len(bot.db_connection.users.calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_release_after_rollover_keeps_count(self):
+        """Test that a slot reserved yesterday is not taken from today's count"""
+        bot = self.make_bot({"last_upload_day": "2026-10-17", "upload_count_today": 1})
+        
+        await bot.release_upload_slot(1, YESTERDAY)
+        assert bot.db_connection.users.doc["upload_count_today"] == 1
+
+def build_archive(members):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        for name, data in members.items():
+            zip_ref.writestr(name, data)
+    archive.seek(0)
+    return archive
+
+class TestTdataExtraction:
+    
+    def test_extracts_only_tdata_folder(self):
+        """Test that the folder holding key_datas is extracted with its contents, and nothing else"""
+        archive = build_archive({
+            "export/tdata/key_datas": b"key",
+            "export/tdata/D877F783D5D3EF8C/maps": b"maps" * 1000,
+            "export/tdata/D877F783D5D3EF8C/configs/settings": b"settings",
+            "export/readme.txt": b"not tdata",
+        })
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            extract_path = os.path.join(temp_dir, "tdata")
+            tdata_path = SellerBot.extract_tdata_archive(archive, extract_path)
+            
+            assert tdata_path == os.path.join(os.path.realpath(extract_path), "export", "tdata")
+            with open(os.path.join(tdata_path, "key_datas"), 'rb') as f:
+                assert f.read() == b"key"
+            with open(os.path.join(tdata_path, "D877F783D5D3EF8C", "maps"), 'rb') as f:
+                assert f.read() == b"maps" * 1000
+            assert os.path.isfile(os.path.join(tdata_path, "D877F783D5D3EF8C", "configs", "settings"))
+            assert not os.path.exists(os.path.join(extract_path, "export", "readme.txt"))
+    
+    def test_rejects_path_traversal(self):
+        """Test that a member escaping the extraction directory aborts before anything is written"""
+        archive = build_archive({
+            "tdata/key_datas": b"key",
+            "tdata/../../escaped.txt": b"evil",
+        })
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            extract_path = os.path.join(temp_dir, "out", "tdata")
+            with pytest.raises(ValueError):
+                SellerBot.extract_tdata_archive(archive, extract_path)
+            
+            # The member would have landed in temp_dir/out, outside out/tdata
+            assert not os.path.exists(os.path.join(temp_dir, "out", "escaped.txt"))
+            assert not os.path.exists(os.path.join(extract_path, "tdata", "key_datas"))
+    
+    def test_missing_key_datas(self):
+        """Test that an archive without key_datas extracts nothing"""
+        archive = build_archive({"tdata/maps": b"maps"})
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            extract_path = os.path.join(temp_dir, "tdata")
+            assert SellerBot.extract_tdata_archive(archive, extract_path) is None
+            assert not os.path.exists(extract_path)